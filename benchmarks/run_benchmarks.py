@@ -0,0 +1,292 @@
+# benchmarks/run_benchmarks.py
+"""
+Performance baseline for the hot paths: loading, feature building, fitting and forecasting.
+
+    python benchmarks/run_benchmarks.py run --sizes 1e3 1e4 1e5
+    python benchmarks/run_benchmarks.py compare            # latest run vs the one before
+    python benchmarks/run_benchmarks.py startup            # dashboard import budget check
+
+Synthetic price and inflation files are generated for each size. Every stage records
+its best wall time over --repeat runs and its peak traced memory; results are
+appended to benchmarks/history.json. Each run also times the dashboard's imports in
+fresh interpreters, so compare flags startup creep like any other stage.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+HISTORY_PATH = os.path.join(ROOT, 'benchmarks', 'history.json')
+# Modules that must not load before the dashboard window is up
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'joblib', 'matplotlib', 'tensorflow')
+
+# Import timing in a fresh interpreter; prints the seconds and the heavy modules pulled in
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'heavy_modules': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+STARTUP_MODULES = {
+    'startup_import': 'views.app_ui',
+    'controller_import': 'controllers.prediction_controller',
+}
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def make_price_csv(n_rows, path, seed=42):
+    """
+    Random-walk closing prices with volumes. Daily dates up to 1e5 rows, minutes beyond
+    so that 1e7 rows still fit in the datetime range. Minute files keep the time of
+    day (in a format the loader parses directly) so every row has its own timestamp.
+    """
+    rng = np.random.default_rng(seed)
+    daily = n_rows <= 100_000
+    dates = pd.date_range('1990-01-01', periods=n_rows, freq='D' if daily else 'min')
+    close = 60 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    volume = rng.integers(1_000_000, 20_000_000, n_rows)
+    pd.DataFrame({'Date': dates.strftime('%Y-%m-%d' if daily else '%Y-%m-%d %H:%M:%S'), 'Close': close.round(2),
+                  'Volume': volume}).to_csv(path, index=False)
+    return dates
+
+
+def check_dates(df, path):
+    """
+    Benchmarks must fit an ordered series; duplicate or shuffled dates would time a different problem.
+    """
+    dates = df['Date']
+    if not (dates.is_unique and dates.is_monotonic_increasing):
+        raise RuntimeError(f"{path}: generated dates are not unique and increasing "
+                           f"({dates.nunique():,} distinct of {len(dates):,}).")
+
+
+def make_inflation_csv(dates, path, seed=42):
+    """
+    Wide Year x Jan..Dec inflation table covering the price dates.
+    """
+    rng = np.random.default_rng(seed)
+    years = np.arange(dates[0].year, dates[-1].year + 1)
+    table = pd.DataFrame(rng.uniform(1.0, 4.0, (len(years), 12)).round(2), columns=MONTHS)
+    table.insert(0, 'Year', years)
+    table.to_csv(path, index=False)
+
+
+def measure(fn, repeat):
+    """
+    Best wall time over 'repeat' runs, plus peak traced memory from one extra run.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': min(times), 'peak_mb': peak / 1024 / 1024}
+
+
+def bench_size(n_rows, repeat, max_forest_rows, workdir):
+    from controllers.prediction_controller import PredictionController
+    from models.baseline_model import run_naive_baseline
+    from models.random_forest_model import run_random_forest
+    from models.regression_model import forecast_future_prices, forecast_price_intervals, run_linear_regression
+    from utils.data_loader import load_csv
+    from utils.features import build_lag_features, clear_feature_cache
+
+    price_path = os.path.join(workdir, f'prices_{n_rows}.csv')
+    inflation_path = os.path.join(workdir, f'inflation_{n_rows}.csv')
+    make_inflation_csv(make_price_csv(n_rows, price_path), inflation_path)
+
+    controller = PredictionController()
+    df = load_csv(price_path, use_cache=False)
+    check_dates(df, price_path)
+    controller.load_inflation_data(inflation_path)
+    inflation_df = controller.inflation_df
+
+    def uncached(fn):
+        # Every model shares the feature cache; clear it so each stage pays its own cost
+        def run():
+            clear_feature_cache()
+            return fn()
+        return run
+
+    stages = {
+        'load_csv': lambda: load_csv(price_path, use_cache=False),
+        'load_csv_cached': lambda: load_csv(price_path, cache_dir=os.path.join(workdir, 'cache')),
+        'load_csv_compact': lambda: load_csv(price_path, use_cache=False, compact=True),
+        'load_inflation_data': lambda: controller.load_inflation_data(inflation_path),
+        'lag_features': uncached(lambda: build_lag_features(df, inflation_df, 5)),
+        'run_naive_baseline': lambda: run_naive_baseline(df),
+        'run_linear_regression': uncached(lambda: run_linear_regression(df, inflation_df)),
+        'run_random_forest': uncached(lambda: run_random_forest(df, inflation_df)),
+        'forecast_future_prices': uncached(lambda: forecast_future_prices(df, inflation_df, n_months=120)),
+        'forecast_price_intervals': uncached(lambda: forecast_price_intervals(df, inflation_df, n_months=120,
+                                                                              n_paths=10000)),
+    }
+
+    # Prime the sidecar so the cached load measures the warm path
+    load_csv(price_path, cache_dir=os.path.join(workdir, 'cache'))
+
+    results = {}
+    for name, fn in stages.items():
+        if name == 'run_random_forest' and n_rows > max_forest_rows:
+            continue
+        results[name] = measure(fn, repeat)
+        print(f"  {name:<24} {results[name]['seconds'] * 1000:10.2f} ms  {results[name]['peak_mb']:9.1f} MB")
+    return results
+
+
+def measure_startup(module, repeat):
+    """
+    Best import time of 'module' over 'repeat' fresh interpreters, with the heavy
+    modules it loaded.
+    """
+    script = STARTUP_SCRIPT.format(module=module, heavy=HEAVY_MODULES)
+    runs = [json.loads(subprocess.check_output([sys.executable, '-c', script], cwd=ROOT, text=True))
+            for _ in range(repeat)]
+    return {'seconds': min(r['seconds'] for r in runs), 'heavy_modules': runs[0]['heavy_modules']}
+
+
+def bench_startup(repeat):
+    results = {}
+    for name, module in STARTUP_MODULES.items():
+        results[name] = measure_startup(module, repeat)
+        heavy = ', '.join(results[name]['heavy_modules']) or 'none'
+        print(f"  {name:<24} {results[name]['seconds'] * 1000:10.2f} ms  heavy: {heavy}")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def run(args):
+    sizes = [int(float(size)) for size in args.sizes]
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'label': args.label,
+        'results': {},
+    }
+
+    print("startup")
+    record['results'].update(bench_startup(args.repeat))
+
+    with tempfile.TemporaryDirectory(prefix='oil_bench_') as workdir:
+        for n_rows in sizes:
+            print(f"{n_rows:,} rows")
+            for stage, result in bench_size(n_rows, args.repeat, args.max_forest_rows, workdir).items():
+                record['results'][f'{stage}@{n_rows}'] = result
+
+    history = load_history(args.history)
+    history.append(record)
+    with open(args.history, 'w') as f:
+        json.dump(history, f, indent=2)
+    print(f"Saved run {len(history) - 1} to {args.history}")
+    return 0
+
+
+def compare(args):
+    """
+    Flags stages whose time grew by more than --threshold (relative) and --min-ms.
+    """
+    history = load_history(args.history)
+    if len(history) < 2:
+        print("Need at least two runs in the history to compare.")
+        return 0
+
+    base, head = history[args.base], history[args.head]
+    print(f"base: {base['timestamp']} ({base['commit']})  head: {head['timestamp']} ({head['commit']})")
+
+    regressions = 0
+    for key in sorted(set(base['results']) & set(head['results'])):
+        before, after = base['results'][key]['seconds'], head['results'][key]['seconds']
+        ratio = after / before if before else float('inf')
+        slower = ratio > 1 + args.threshold and (after - before) * 1000 > args.min_ms
+        regressions += slower
+        flag = 'REGRESSION' if slower else ''
+        print(f"  {key:<36} {before * 1000:10.2f} -> {after * 1000:10.2f} ms  x{ratio:5.2f}  {flag}")
+
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def startup(args):
+    """
+    Fails when the dashboard imports a heavy module up front or exceeds --budget-ms.
+    """
+    result = bench_startup(args.repeat)['startup_import']
+    failures = []
+    if result['heavy_modules']:
+        failures.append(f"views.app_ui imports {', '.join(result['heavy_modules'])} at startup")
+    if result['seconds'] * 1000 > args.budget_ms:
+        failures.append(f"startup import took {result['seconds'] * 1000:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark load, feature build, fit and forecast.")
+    parser.add_argument('--history', default=HISTORY_PATH, help="JSON history file.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the benchmarks and append to the history.")
+    run_parser.add_argument('--sizes', nargs='+', default=['1e3', '1e4', '1e5'],
+                            help="Row counts, e.g. 1e3 1e5 1e7.")
+    run_parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage (best is kept).")
+    run_parser.add_argument('--max-forest-rows', type=float, default=2e4,
+                            help="Skip the Random Forest above this many rows.")
+    run_parser.add_argument('--label', help="Free-form note stored with the run.")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help="Compare two runs from the history.")
+    compare_parser.add_argument('--base', type=int, default=-2, help="History index of the baseline run.")
+    compare_parser.add_argument('--head', type=int, default=-1, help="History index of the new run.")
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative slowdown.")
+    compare_parser.add_argument('--min-ms', type=float, default=5.0, help="Ignore slowdowns below this.")
+    compare_parser.set_defaults(func=compare)
+
+    startup_parser = commands.add_parser('startup', help="Check the dashboard's import time and heavy imports.")
+    startup_parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters to time (best is kept).")
+    startup_parser.add_argument('--budget-ms', type=float, default=500.0, help="Allowed startup import time.")
+    startup_parser.set_defaults(func=startup)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# cli.py
+"""
+Headless batch runner for cron jobs and containers without a display.
+
+    python cli.py --data "data/data_to_use/*.csv" --inflation data/data_to_use/inflation_large_sample.csv \
+                  --models linear random_forest --out results --workers 8
+
+Writes, per dataset, <out>/<name>/metrics.json, <model>_predictions.csv and forecast.csv,
+plus <out>/summary.csv across all datasets. With --tune, the Random Forest parameters are
+searched first and the best configuration is written to <out>/<name>/tuning.json. With
+--artifacts DIR, fitted linear and forest models are saved to that artifact store.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+MODEL_CHOICES = ["baseline", "linear", "random_forest", "online", "lstm"]
+
+
+def run_dataset(data_path, inflation_path, models, n_months, out_dir, tune=False, macro_paths=(), artifact_dir=None,
+                compact=False):
+    """
+    Process-pool worker: runs every requested model on one dataset and writes its outputs.
+    Returns the summary rows for the dataset.
+    """
+    import pandas as pd
+    from controllers.prediction_controller import PredictionController
+
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    target = os.path.join(out_dir, name)
+    os.makedirs(target, exist_ok=True)
+
+    # Each worker process fits on one core
+    controller = PredictionController(n_jobs=1, artifact_dir=artifact_dir, compact=compact)
+    if controller.load_dataset(data_path) is None:
+        return [{"dataset": name, "model": model, "error": "failed to load CSV"} for model in models]
+    if inflation_path:
+        controller.load_inflation_data(inflation_path)
+    for macro_path in macro_paths:
+        controller.load_macro_series(macro_path)
+
+    rows, metrics = [], {}
+    if tune and "random_forest" in models:
+        try:
+            tuning = controller.tune_random_forest_model()
+            with open(os.path.join(target, "tuning.json"), "w") as f:
+                json.dump({"best_params": tuning["best_params"], "cv_rmse": tuning["best_rmse"],
+                           "candidates": tuning["n_candidates"], "fits": tuning["n_fits"],
+                           "seconds": round(tuning["seconds"], 2)}, f, indent=2)
+        except Exception as e:
+            metrics["tuning_error"] = str(e)
+
+    # Every model is scored on the same test rows, as in the dashboard's comparison
+    leaderboard, results = controller.compare_models(models, max_workers=1)
+    for _, row in leaderboard.iterrows():
+        model = row["Model"]
+        if row["Error"]:
+            rows.append({"dataset": name, "model": model, "error": row["Error"]})
+            continue
+        y_test, y_pred = results[model]
+
+        predictions = pd.DataFrame({"Actual": y_test.to_numpy(), "Predicted": y_pred})
+        if "Date" in controller.data.columns:
+            predictions.insert(0, "Date", controller.data.loc[y_test.index, "Date"].to_numpy())
+        predictions.to_csv(os.path.join(target, f"{model}_predictions.csv"), index=False)
+
+        metrics[model] = {"rmse": float(row["RMSE"]), "mae": float(row["MAE"]), "test_rows": len(predictions),
+                          "seconds": round(float(row["Seconds"]), 4)}
+        if artifact_dir and model in ("linear", "random_forest"):
+            metrics[model]["artifact_version"] = controller.store_model(model)
+        rows.append(dict({"dataset": name, "model": model, "error": None}, **metrics[model]))
+
+    try:
+        forecast = controller.forecast_next_months(n_months)
+        forecast.to_csv(os.path.join(target, "forecast.csv"), index=False, date_format="%Y-%m-%d")
+    except Exception as e:
+        metrics["forecast_error"] = str(e)
+
+    with open(os.path.join(target, "metrics.json"), "w") as f:
+        json.dump(metrics, f, indent=2)
+
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run price models over many datasets without the dashboard.")
+    parser.add_argument("--data", required=True, nargs="+",
+                        help="Price CSV paths or glob patterns (quote globs).")
+    parser.add_argument("--inflation", help="Optional inflation CSV (Year, Jan..Dec, or Date, Inflation).")
+    parser.add_argument("--macros", nargs="+", default=[],
+                        help="Extra macro feature CSVs (FRED exports, EIA weekly stocks).")
+    parser.add_argument("--models", nargs="+", choices=MODEL_CHOICES, default=["baseline", "linear"],
+                        help="Models to run on each dataset.")
+    parser.add_argument("--months", type=int, default=12, help="Forecast horizon in months.")
+    parser.add_argument("--out", default="results", help="Output directory.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    parser.add_argument("--artifacts",
+                        help="Directory of versioned fitted models; linear and forest fits are saved there.")
+    parser.add_argument("--compact", action="store_true",
+                        help="Load prices as float32 with categorical text and only the used columns.")
+    parser.add_argument("--tune", action="store_true",
+                        help="Search Random Forest parameters before running it (slow).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    paths = sorted({path for pattern in args.data for path in glob.glob(pattern)})
+    if not paths:
+        print(f"No datasets match {args.data}")
+        return 1
+
+    os.makedirs(args.out, exist_ok=True)
+    summary = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(run_dataset, path, args.inflation, args.models, args.months, args.out,
+                               args.tune, args.macros, args.artifacts, args.compact): path
+                   for path in paths}
+        for future in as_completed(futures):
+            try:
+                rows = future.result()
+            except Exception as e:
+                rows = [{"dataset": futures[future], "model": None, "error": str(e)}]
+            for row in rows:
+                status = row["error"] or f"RMSE {row['rmse']:.2f}, MAE {row['mae']:.2f}"
+                print(f"[{row['dataset']}] {row['model']}: {status}")
+            summary.extend(rows)
+
+    import pandas as pd
+    pd.DataFrame(summary).to_csv(os.path.join(args.out, "summary.csv"), index=False)
+
+    failed = sum(1 for row in summary if row["error"])
+    print(f"Finished {len(paths)} datasets, {failed} failed runs. Results in {args.out}")
+    return 1 if failed == len(summary) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+# config.py
+
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Binary sidecars written by utils.data_loader.load_csv for fast re-loads
+INGEST_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'processed', 'ingest_cache')
+
+RAW_DATA_DIR = os.path.join(BASE_DIR, 'data', 'raw')
+PROCESSED_DATA_DIR = os.path.join(BASE_DIR, 'data', 'processed')
+
+# Saved LSTM weights, reused to warm-start later training runs
+LSTM_CHECKPOINT_DIR = os.path.join(PROCESSED_DATA_DIR, 'checkpoints')
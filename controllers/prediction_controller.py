@@ -1,58 +1,528 @@
 from models.baseline_model import run_naive_baseline
-from models.regression_model import run_linear_regression, forecast_future_prices
-from models.random_forest_model import run_random_forest
+from models.online_model import OnlineForecaster, run_online_regression
+from utils.features import build_lag_features, feature_cache_mb, find_price_col, fingerprint
+from utils.metrics import batch_metrics
+from utils.model_cache import ModelCache
+from utils.artifact_store import ArtifactStore
+from utils.macro_registry import MacroRegistry, read_inflation
+from utils.tracing import traced
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import threading
+import time
+import numpy as np
 import pandas as pd
 
+_MODEL_IMPORT_LOCK = threading.Lock()
+
+# Models with a fitted estimator that can be served, stored and reloaded
+FITTED_MODELS = ("linear", "random_forest")
+
+
+def import_models():
+    """
+    Imports the scikit-learn models (linear, forest, tuning, backtest, and the LSTM's
+    scaler) on first use, so importing the controller stays cheap for the dashboard's
+    startup. The lock matters: scikit-learn's first import fails when two threads run
+    it at once. TensorFlow itself is still only imported when an LSTM is trained.
+    """
+    with _MODEL_IMPORT_LOCK:
+        import models.regression_model  # noqa: F401
+        import models.random_forest_model  # noqa: F401
+        import models.tuning  # noqa: F401
+        import models.backtest  # noqa: F401
+        import models.lstm_model  # noqa: F401
+
+
+def run_model(model, df, inflation_df=None, n_jobs=-1, macros=None):
+    """
+    Dispatches 'baseline', 'linear', 'random_forest' or 'lstm' to its model function.
+    n_jobs is passed to the Random Forest, macros to the lag models.
+    """
+    if model == "baseline":
+        return run_naive_baseline(df)
+    elif model == "linear":
+        import_models()
+        from models.regression_model import run_linear_regression
+        return run_linear_regression(df, inflation_df, macros=macros)
+    elif model == "random_forest":
+        import_models()
+        from models.random_forest_model import run_random_forest
+        return run_random_forest(df, inflation_df, n_jobs=n_jobs, macros=macros)
+    elif model == "lstm":
+        import_models()
+        from models.lstm_model import run_lstm_model
+        return run_lstm_model(df)
+    raise ValueError(f"Unknown model '{model}'.")
+
+
+def train_symbol(symbol, df, inflation_df, model, n_months, macros=None):
+    """
+    Process-pool worker: fits one symbol's partition and forecasts it.
+    """
+    import_models()
+    from models.regression_model import forecast_future_prices
+    try:
+        # One core per worker; the pool already uses them all
+        rmse, mae, y_test, y_pred = run_model(model, df, inflation_df, n_jobs=1, macros=macros)
+        forecast = forecast_future_prices(df, inflation_df, n_months=n_months, macros=macros)
+    except Exception as e:
+        return {"Symbol": symbol, "Rows": len(df), "RMSE": None, "MAE": None, "Error": str(e)}, None
+
+    forecast.insert(0, "Symbol", symbol)
+    return {"Symbol": symbol, "Rows": len(df), "RMSE": rmse, "MAE": mae, "Error": None}, forecast
+
+
+def _loaded_rows(controller, *args, **kwargs):
+    return controller.data
+
 class PredictionController:
-    def __init__(self):
+    def __init__(self, cache_dir=None, n_jobs=-1, artifact_dir=None, compact=False):
         self.data = None
         self.inflation_df = None
+        self.data_fingerprint = None
+        self.inflation_fingerprint = None
+        # Extra macro series (CPI, Fed Funds, EIA stocks, ...) used as model features
+        self.macros = MacroRegistry()
+        # Fitted models, predictions and metrics from earlier runs on the same inputs
+        self.cache = ModelCache(max_entries=16, disk_dir=cache_dir)
+        # Versioned fitted estimators that outlive the process (see store_model)
+        self.artifacts = ArtifactStore(artifact_dir) if artifact_dir else None
+        # Cores per Random Forest fit or search; use 1 inside a process pool
+        self.n_jobs = n_jobs
+        # Best Random Forest parameters from tune_random_forest_model, used by later runs
+        self.forest_params = {}
+        # Online linear model fed by update_online_model, started on demand
+        self.online_model = None
+        # Load price data with float32 prices, categorical text and only the used columns
+        self.compact = compact
+        # Cache entry of the last cached_run on each thread, for compare_models' fit times
+        self.last_run = threading.local()
 
-    def load_dataset(self, file_path):
-        from utils.data_loader import load_csv
-        self.data = load_csv(file_path)
+    @traced()
+    def load_dataset(self, file_path, chunksize=None, compact=None):
+        from utils.data_loader import load_csv, LARGE_FILE_BYTES, DEFAULT_CHUNKSIZE
+        compact = self.compact if compact is None else compact
+        # Chunking only lowers the peak when each chunk is compacted before the concat;
+        # a plain chunked load holds every chunk plus the joined copy
+        if (chunksize is None and compact and os.path.exists(file_path)
+                and os.path.getsize(file_path) > LARGE_FILE_BYTES):
+            chunksize = DEFAULT_CHUNKSIZE
+        self.data = load_csv(file_path, chunksize=chunksize, compact=compact)
+        self.data_fingerprint = fingerprint(self.data) if self.data is not None else None
+        # Tuned parameters and the online model belong to the previous dataset
+        self.forest_params = {}
+        self.online_model = None
         return self.data
 
+    def summarize_prices(self, file_path=None):
+        """
+        Average/high/low price of the loaded data, or streamed from file_path
+        without loading the whole file (memory bounded by one chunk).
+        """
+        from utils.data_loader import PriceSummary, reduce_csv
+        if file_path:
+            return reduce_csv(file_path, PriceSummary())
+        summary = PriceSummary()
+        if self.data is not None:
+            summary.update(self.data)
+        return summary
+
+    @traced()
     def load_inflation_data(self, inflation_path):
+        """
+        Reads inflation in the wide (Year, Jan..Dec) or long (Date, Inflation) layout.
+        """
         try:
-            raw_df = pd.read_csv(inflation_path)
-            melted = raw_df.melt(id_vars='Year', var_name='Month', value_name='Inflation')
-            month_map = {
-                'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-                'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-            }
-            melted = melted[melted['Month'].isin(month_map)]
-            melted['Date'] = pd.to_datetime(melted['Year'].astype(str) + '-' + melted['Month'].map(month_map) + '-01')
-            self.inflation_df = melted[['Date', 'Inflation']].sort_values('Date').reset_index(drop=True)
+            self.inflation_df = read_inflation(inflation_path)
         except Exception as e:
             print(f"[Error loading inflation data] {e}")
             self.inflation_df = None
+        self.inflation_fingerprint = fingerprint(self.inflation_df)
+        self.online_model = None
+
+    @traced()
+    def load_macro_series(self, path, name=None):
+        """
+        Registers a macro series file (FRED export, EIA weekly stocks, or an inflation
+        table) as an extra feature for the lag models. Returns the series.
+        """
+        series = self.macros.load(path, name)
+        self.online_model = None
+        return series
+
+    def memory_usage(self):
+        """
+        [(stage, MB)] for what the controller holds: the price frame, inflation, macro
+        series and the cached lag feature matrices.
+        """
+        from utils.data_loader import frame_memory_mb
+        stages = []
+        if self.data is not None:
+            stages.append(("Price data", frame_memory_mb(self.data)))
+        if self.inflation_df is not None:
+            stages.append(("Inflation data", frame_memory_mb(self.inflation_df)))
+        if len(self.macros):
+            stages.append(("Macro series", sum(s.dates.nbytes + s.values.nbytes
+                                               for s in self.macros.series.values()) / 1024 / 1024))
+        stages.append(("Lag features", feature_cache_mb()))
+        return stages
 
+    def inputs_fingerprint(self):
+        # Everything besides the price data that changes the features
+        return self.inflation_fingerprint, self.macros.fingerprint()
+
+    def cached_run(self, model_type, params, run):
+        """
+        Returns the cache entry for (data, inflation, model_type, params), calling
+        run() -> (rmse, mae, y_test, y_pred, model) only on a miss. The entry keeps
+        how long run() took, so cache hits still report the original fit time.
+        """
+        key = ModelCache.make_key(self.data_fingerprint, self.inputs_fingerprint(), model_type, params)
+
+        def compute():
+            start = time.perf_counter()
+            rmse, mae, y_test, y_pred, model = run()
+            return {"model": model, "rmse": rmse, "mae": mae, "y_test": y_test, "y_pred": y_pred,
+                    "seconds": time.perf_counter() - start}
+
+        entry = self.cache.get_or_compute(key, compute)
+        self.last_run.entry = entry
+        return entry
+
+    @traced(rows=_loaded_rows)
     def run_baseline_model(self):
         if self.data is not None:
-            rmse, mae, y_test, y_pred = run_naive_baseline(self.data)
-            return rmse, mae, y_test, y_pred
+            entry = self.cached_run("baseline", {}, lambda: run_naive_baseline(self.data) + (None,))
+            return entry["rmse"], entry["mae"], entry["y_test"], entry["y_pred"]
         else:
             return 0.0, 0.0, None, None
 
 
-    def run_linear_regression_model(self):
+    @traced(rows=_loaded_rows)
+    def run_linear_regression_model(self, n_lags=5):
+        if self.data is not None:
+            import_models()
+            from models.regression_model import run_linear_regression
+            entry = self.cached_run("linear", {"n_lags": n_lags}, lambda: run_linear_regression(
+                self.data, self.inflation_df, n_lags=n_lags, return_model=True, macros=self.macros))
+            return entry["rmse"], entry["mae"], entry["y_test"], entry["y_pred"]
+        else:
+            return 0.0, 0.0, None, None
+
+    def forest_config(self, n_lags=None):
+        """
+        Random Forest keyword arguments: the tuned ones if any, with n_lags overridden when given.
+        """
+        params = dict({"n_lags": 5}, **self.forest_params)
+        if n_lags is not None:
+            params["n_lags"] = n_lags
+        return params
+
+    @traced(rows=_loaded_rows)
+    def run_random_forest_model(self, n_lags=None):
+        if self.data is not None:
+            import_models()
+            from models.random_forest_model import run_random_forest
+            params = self.forest_config(n_lags)
+            entry = self.cached_run("random_forest", params, lambda: run_random_forest(
+                self.data, self.inflation_df, return_model=True, n_jobs=self.n_jobs, macros=self.macros, **params))
+            return entry["rmse"], entry["mae"], entry["y_test"], entry["y_pred"]
+        else:
+            return 0.0, 0.0, None, None
+
+    def model_params(self, model, n_lags=None):
+        if model == "random_forest":
+            return self.forest_config(n_lags)
+        return {"n_lags": 5 if n_lags is None else n_lags}
+
+    def fit_entry(self, model, params):
+        # Cache entry of a 'linear' or 'random_forest' run, shared with run_*_model
+        if model not in FITTED_MODELS:
+            raise ValueError(f"Unknown model '{model}'; expected one of {', '.join(FITTED_MODELS)}.")
+        if model == "random_forest":
+            import_models()
+            from models.random_forest_model import run_random_forest
+            return self.cached_run(model, params, lambda: run_random_forest(
+                self.data, self.inflation_df, return_model=True, n_jobs=self.n_jobs, macros=self.macros, **params))
+        import_models()
+        from models.regression_model import run_linear_regression
+        return self.cached_run(model, params, lambda: run_linear_regression(
+            self.data, self.inflation_df, n_lags=params["n_lags"], return_model=True, macros=self.macros))
+
+    def artifact_criteria(self, params):
+        # What a stored model must have been trained on to be reused for the loaded data
+        return {"params": params, "data_fingerprint": self.data_fingerprint,
+                "inputs_fingerprint": list(self.inputs_fingerprint())}
+
+    def fitted_model(self, model="linear", n_lags=5):
+        """
+        Fitted 'linear' or 'random_forest' estimator, served from the cache (shared with
+        run_*_model), else from a stored artifact trained on the same inputs, else
+        trained now (and stored when an artifact store is configured).
+        """
+        params = self.model_params(model, n_lags)
+        entry = self.cache.get(ModelCache.make_key(self.data_fingerprint, self.inputs_fingerprint(), model, params))
+        if entry is not None:
+            return entry["model"]
+        if self.artifacts is not None:
+            version = self.artifacts.find(model, **self.artifact_criteria(params))
+            if version is not None:
+                return self.artifacts.load(model, version)[0]
+
+        # Neither the cache nor the store had it: train, and store what was trained
+        entry = self.fit_entry(model, params)
+        if self.artifacts is not None:
+            self.store_model(model, n_lags)
+        return entry["model"]
+
+    def store_model(self, model="linear", n_lags=None):
+        """
+        Saves the fitted estimator with its lag config, feature columns, input
+        fingerprints and test metrics, unless an identical one is already stored.
+        Returns the artifact version, or None without a loaded dataset or store.
+        """
+        if self.data is None or self.artifacts is None:
+            return None
+        params = self.model_params(model, n_lags)
+        criteria = self.artifact_criteria(params)
+        version = self.artifacts.find(model, **criteria)
+        if version is None:
+            entry = self.fit_entry(model, params)
+            features = build_lag_features(self.data, self.inflation_df, params["n_lags"], self.macros)
+            version = self.artifacts.save(model, entry["model"], feature_cols=features.feature_cols,
+                                          price_col=features.price_col, rows=len(self.data),
+                                          rmse=float(entry["rmse"]), mae=float(entry["mae"]), **criteria)
+        return version
+
+    @traced(rows=_loaded_rows)
+    def tune_random_forest_model(self, **search_options):
+        """
+        Searches Random Forest parameters on the loaded data (see models.tuning) and
+        keeps the best ones for later run_random_forest_model calls.
+        """
+        if self.data is None:
+            return None
+        import_models()
+        from models.tuning import tune_random_forest
+        result = tune_random_forest(self.data, self.inflation_df, n_jobs=self.n_jobs, macros=self.macros,
+                                    **search_options)
+        self.forest_params = result["best_params"]
+        return result
+
+    @traced(rows=_loaded_rows)
+    def run_online_model(self, n_lags=5, forgetting=0.99):
+        """
+        Recursive least squares scored one step at a time over the test period.
+        """
         if self.data is not None:
-            rmse, mae, y_test, y_pred = run_linear_regression(self.data, self.inflation_df)
-            return rmse, mae, y_test, y_pred
+            entry = self.cached_run("online", {"n_lags": n_lags, "forgetting": forgetting},
+                                    lambda: run_online_regression(self.data, self.inflation_df, n_lags=n_lags,
+                                                                  forgetting=forgetting, return_model=True,
+                                                                  macros=self.macros))
+            return entry["rmse"], entry["mae"], entry["y_test"], entry["y_pred"]
         else:
             return 0.0, 0.0, None, None
 
-    def run_random_forest_model(self):
+    @traced(rows=_loaded_rows)
+    def start_online_model(self, n_lags=5, forgetting=1.0):
+        """
+        Fits the online linear model on the loaded history; later prices go to update_online_model.
+        """
+        if self.data is None:
+            return None
+        self.online_model = OnlineForecaster.from_history(self.data, self.inflation_df, n_lags=n_lags,
+                                                          forgetting=forgetting, macros=self.macros)
+        return self.online_model
+
+    def update_online_model(self, price, date=None, n_months=12):
+        """
+        Feeds one new price to the online model (started with defaults if needed) and
+        returns (predicted, forecast): what the model expected for this price and the
+        refreshed forecast. The cost does not grow with the history.
+        """
+        if self.online_model is None and self.start_online_model() is None:
+            return None, pd.DataFrame(columns=["Month", "Forecasted Price"])
+        predicted = self.online_model.update(price, date)
+        return predicted, self.online_model.forecast(n_months)
+
+    @traced(rows=_loaded_rows)
+    def run_lstm_model(self, window=30):
         if self.data is not None:
-            rmse, mae, y_test, y_pred = run_random_forest(self.data, self.inflation_df)
-            return rmse, mae, y_test, y_pred
+            # TensorFlow is only imported once the LSTM is actually chosen
+            import_models()
+            from models.lstm_model import run_lstm_model
+            # Warm-start checkpoints are kept per dataset and inputs
+            data_key = ModelCache.make_key(self.data_fingerprint, self.inputs_fingerprint(), "lstm")
+            entry = self.cached_run("lstm", {"window": window}, lambda: run_lstm_model(
+                self.data, window=window, return_model=True, data_key=data_key))
+            return entry["rmse"], entry["mae"], entry["y_test"], entry["y_pred"]
         else:
             return 0.0, 0.0, None, None
 
-    def forecast_next_months(self, n_months=12):
+    def model_runners(self):
+        """
+        Runner for every model name, each returning (rmse, mae, y_test, y_pred);
+        a new model only needs an entry here to take part in compare_models.
+        Runners accept n_lags, which models without lag features ignore.
+        """
+        return {
+            "baseline": lambda **kwargs: self.run_baseline_model(),
+            "linear": self.run_linear_regression_model,
+            "random_forest": self.run_random_forest_model,
+            "online": self.run_online_model,
+            "lstm": lambda **kwargs: self.run_lstm_model(),
+        }
+
+    @traced(rows=_loaded_rows)
+    def compare_models(self, models=("baseline", "linear", "random_forest", "online"), n_lags=None, max_workers=None):
+        """
+        Runs several models on the loaded data at once and ranks them by test RMSE.
+        The lag features are built once up front, so every lag model reads the same
+        cached matrix; the models then fit concurrently on a thread pool (NumPy and
+        the forest's tree building release the GIL). Without n_lags each model keeps
+        its usual lag count (5, or the tuned one for the forest).
+
+        Every model is scored on the same test rows, the dates all of them predicted
+        (the naive baseline predicts every row, the lag models their last 20%), so the
+        ranking compares like with like.
+
+        Returns (leaderboard, results): one row per model with its metrics and fit
+        time, and {model: (y_test, y_pred)} on those common rows for the models that
+        succeeded. The fit time is the one recorded when the model was trained, also for
+        cached runs (NaN for cache entries written before fit times were kept).
+        """
+        columns = ["Model", "RMSE", "MAE", "MAPE", "Directional Accuracy", "Accuracy", "Test Rows", "Seconds",
+                   "Error"]
+        if self.data is None:
+            return pd.DataFrame(columns=columns), {}
+
+        runners = self.model_runners()
+        unknown = [model for model in models if model not in runners]
+        if unknown:
+            raise ValueError(f"Unknown models: {', '.join(unknown)}.")
+
+        lag_counts = {self.forest_config(n_lags)["n_lags"] if model == "random_forest" else n_lags or 5
+                      for model in models if model in ("linear", "random_forest")}
+        for lags in lag_counts:
+            build_lag_features(self.data, self.inflation_df, lags, self.macros)
+
+        kwargs = {} if n_lags is None else {"n_lags": n_lags}
+
+        def timed(model):
+            self.last_run.entry = None
+            result = runners[model](**kwargs)
+            entry = self.last_run.entry or {}
+            return result, entry.get("seconds", float("nan"))
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(models)) as pool:
+            futures = {model: pool.submit(timed, model) for model in models}
+
+        rows, predictions, timings = [], {}, {}
+        for model, future in futures.items():
+            try:
+                (_, _, y_test, y_pred), timings[model] = future.result()
+            except Exception as e:
+                rows.append({"Model": model, "Error": str(e)})
+                continue
+            # Predictions by data row; plain arrays (the baseline) cover the last rows
+            index = y_test.index if isinstance(y_test, pd.Series) else self.data.index[len(self.data) - len(y_test):]
+            predictions[model] = pd.DataFrame({"actual": np.asarray(y_test, dtype=float),
+                                               "predicted": np.asarray(y_pred, dtype=float).ravel()}, index=index)
+
+        common = None
+        for frame in predictions.values():
+            common = frame.index if common is None else common.intersection(frame.index)
+
+        results = {}
+        for model, frame in predictions.items():
+            frame = frame.loc[common]
+            y_test = frame["actual"].rename(find_price_col(self.data))
+            scores = batch_metrics(y_test.to_numpy(), frame["predicted"].to_numpy())
+            rows.append({"Model": model, "RMSE": float(scores["rmse"]), "MAE": float(scores["mae"]),
+                         "MAPE": float(scores["mape"]), "Directional Accuracy": float(scores["directional_accuracy"]),
+                         "Accuracy": float(scores["accuracy"]), "Test Rows": len(frame), "Seconds": timings[model],
+                         "Error": None})
+            results[model] = (y_test, frame["predicted"].to_numpy())
+
+        leaderboard = pd.DataFrame(rows, columns=columns).sort_values("RMSE", na_position="last")
+        return leaderboard.reset_index(drop=True), results
+
+    def forecast_model(self, n_lags=5):
+        """
+        Linear model fitted on the full history, shared by every forecast call.
+        """
+        import_models()
+        from models.regression_model import fit_forecast_model
+        key = ModelCache.make_key(self.data_fingerprint, self.inputs_fingerprint(), "linear_forecast",
+                                  {"n_lags": n_lags})
+        entry = self.cache.get_or_compute(
+            key, lambda: {"model": fit_forecast_model(self.data, self.inflation_df, n_lags, self.macros)[0]})
+        return entry["model"]
+
+    @traced(rows=_loaded_rows)
+    def forecast_next_months(self, n_months=12, n_paths=10000, quantiles=(5, 50, 95)):
+        """
+        Linear forecast with bootstrap bands from n_paths simulated paths (one column per
+        quantile, e.g. '5%'); n_paths=0 gives the point forecast alone.
+        """
         if self.data is not None:
-            return forecast_future_prices(self.data, self.inflation_df, n_months=n_months)
+            import_models()
+            from models.regression_model import forecast_future_prices, forecast_price_intervals
+            if not n_paths:
+                return forecast_future_prices(self.data, self.inflation_df, n_months=n_months,
+                                              model=self.forecast_model(), macros=self.macros)
+            return forecast_price_intervals(self.data, self.inflation_df, n_months=n_months, n_paths=n_paths,
+                                            quantiles=quantiles, model=self.forecast_model(), macros=self.macros)
+        else:
+            return pd.DataFrame(columns=["Month", "Forecasted Price"])
+
+    @traced(rows=_loaded_rows)
+    def forecast_scenarios(self, inflation_paths):
+        """
+        One forecast path per row of inflation_paths (n_scenarios x n_months).
+        Requires inflation data to be loaded.
+        """
+        if self.data is not None and self.inflation_df is not None:
+            import_models()
+            from models.regression_model import forecast_price_scenarios
+            return forecast_price_scenarios(self.data, inflation_paths, self.inflation_df,
+                                            model=self.forecast_model(), macros=self.macros)
         else:
-            return pd.DataFrame(columns=["Month", "Forecasted Price"])
\ No newline at end of file
+            return pd.DataFrame()
+
+    @traced(rows=_loaded_rows)
+    def run_backtest(self, model="linear", step=1, horizon=1, window="expanding", window_size=None):
+        """
+        Walk-forward backtest of 'linear' or 'random_forest' over the loaded dataset.
+        """
+        if self.data is not None:
+            import_models()
+            from models.backtest import run_walk_forward
+            return run_walk_forward(self.data, self.inflation_df, model=model, step=step,
+                                    horizon=horizon, window=window, window_size=window_size, macros=self.macros)
+        else:
+            return 0.0, 0.0, pd.DataFrame(columns=["Origin", "Date", "Step", "Previous", "Actual", "Predicted"])
+
+    @traced(rows=_loaded_rows)
+    def run_per_symbol(self, model="linear", n_months=12, max_workers=None):
+        """
+        Trains 'model' separately for every value of the 'Symbol' column on a process pool.
+        Returns (metrics, forecasts): one metrics row per symbol and the stacked forecasts.
+        """
+        empty_forecasts = pd.DataFrame(columns=["Symbol", "Month", "Forecasted Price"])
+        if self.data is None or "Symbol" not in self.data.columns:
+            return pd.DataFrame(columns=["Symbol", "Rows", "RMSE", "MAE", "Error"]), empty_forecasts
+
+        partitions = [(symbol, group) for symbol, group in self.data.groupby("Symbol", sort=True, observed=True)]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(train_symbol, symbol, group, self.inflation_df, model, n_months, self.macros)
+                       for symbol, group in partitions]
+            results = [future.result() for future in futures]
+
+        metrics = pd.DataFrame([row for row, _ in results])
+        forecasts = [forecast for _, forecast in results if forecast is not None]
+        forecasts = pd.concat(forecasts, ignore_index=True) if forecasts else empty_forecasts
+
+        return metrics, forecasts
@@ -1,10 +1,16 @@
 # main.py
 
-import tkinter as tk
-from views.app_ui import AppUI
+import sys
 
 if __name__ == "__main__":
+    # Any command-line arguments select the headless batch runner (see cli.py)
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+
+    import tkinter as tk
+    from views.app_ui import AppUI
+
     root = tk.Tk()
     app = AppUI(root)
     root.mainloop()
-
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from models.forecasting import linear_recursion_forecast
+from utils.metrics import batch_metrics
+from utils.features import build_lag_features
+from utils.tracing import traced
+
+
+class IncrementalLinearModel:
+    """
+    Ordinary least squares kept as running sufficient statistics (X'X and X'y).
+    Adding or dropping rows is O(rows * features^2) and solving is O(features^3),
+    so moving the training window never touches the rest of the history.
+    """
+
+    def __init__(self, n_features):
+        self.xtx = np.zeros((n_features + 1, n_features + 1))
+        self.xty = np.zeros(n_features + 1)
+        self.n_rows = 0
+        self.coef_ = None
+
+    @staticmethod
+    def _with_intercept(X):
+        return np.column_stack([np.ones(len(X)), X])
+
+    def add(self, X, y):
+        Xa = self._with_intercept(X)
+        self.xtx += Xa.T @ Xa
+        self.xty += Xa.T @ y
+        self.n_rows += len(y)
+
+    def remove(self, X, y):
+        Xa = self._with_intercept(X)
+        self.xtx -= Xa.T @ Xa
+        self.xty -= Xa.T @ y
+        self.n_rows -= len(y)
+
+    def solve(self):
+        # lstsq on the normal equations also copes with collinear lags
+        self.coef_ = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+        return self.coef_
+
+    def predict(self, X):
+        return X @ self.coef_[1:] + self.coef_[0]
+
+    def forecast(self, history, exog):
+        """
+        Recursive forecast from the lag state 'history' (lag_1 first) with one row of
+        exogenous inputs per step.
+        """
+        n_lags = len(history)
+        return linear_recursion_forecast(self.coef_[0], self.coef_[1:n_lags + 1], history, len(exog),
+                                         exog=exog, exog_coefs=self.coef_[n_lags + 1:])
+
+
+class IncrementalForest:
+    """
+    Random Forest that grows a few new trees on the current window at each origin
+    and retires the oldest ones, instead of rebuilding the whole ensemble.
+    """
+
+    def __init__(self, n_estimators=100, trees_per_refit=10, random_state=42, n_jobs=-1):
+        self.n_estimators = n_estimators
+        self.trees_per_refit = min(trees_per_refit, n_estimators)
+        # A RandomState instance keeps drawing fresh seeds across warm starts
+        self.model = RandomForestRegressor(n_estimators=n_estimators, warm_start=True,
+                                           random_state=np.random.RandomState(random_state),
+                                           n_jobs=n_jobs)
+
+    def update(self, X, y):
+        if hasattr(self.model, 'estimators_'):
+            self.model.n_estimators = len(self.model.estimators_) + self.trees_per_refit
+        self.model.fit(X, y)
+
+        # Keep the ensemble size fixed by dropping the oldest trees
+        if len(self.model.estimators_) > self.n_estimators:
+            self.model.estimators_ = self.model.estimators_[-self.n_estimators:]
+            self.model.n_estimators = self.n_estimators
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+    def forecast(self, history, exog):
+        """
+        Recursive forecast: each prediction is fed back as lag_1 for the next step.
+        """
+        history = np.asarray(history, dtype=float)
+        predictions = []
+        for row in exog:
+            prediction = self.model.predict(np.concatenate((history, row))[np.newaxis])[0]
+            predictions.append(prediction)
+            history = np.concatenate(([prediction], history[:-1]))
+        return np.array(predictions)
+
+
+@traced()
+def run_walk_forward(df, inflation_df=None, model='linear', n_lags=5, step=1, horizon=1,
+                     window='expanding', window_size=None, min_train=None, trees_per_refit=10, macros=None):
+    """
+    Rolling-origin backtest of the lag models.
+    At each origin the model is trained on the rows before it and forecasts the next
+    'horizon' rows recursively from the prices known at the origin, so step h is a
+    genuine h-step-ahead forecast; the origin then moves forward by 'step' rows.
+    Exogenous features (inflation, macros) take their recorded values at each step.
+    window='expanding' keeps all history, window='sliding' keeps the last 'window_size' rows.
+    Returns (rmse, mae, results) where results holds one row per scored prediction,
+    with 'Previous' being the last price known at its origin.
+    """
+    if model not in ('linear', 'random_forest'):
+        raise ValueError("model must be 'linear' or 'random_forest'.")
+    if window not in ('expanding', 'sliding'):
+        raise ValueError("window must be 'expanding' or 'sliding'.")
+    if step < 1 or horizon < 1:
+        raise ValueError("step and horizon must be at least 1.")
+
+    features = build_lag_features(df, inflation_df, n_lags, macros)
+    X, y = features.X, features.y
+    dates = df.loc[features.index, 'Date'].to_numpy() if 'Date' in df.columns else np.asarray(features.index)
+    n_rows = len(y)
+
+    if min_train is None:
+        min_train = int(n_rows * 0.8)
+    if window == 'sliding':
+        if window_size is None:
+            window_size = min_train
+        min_train = max(min_train, window_size)
+
+    if min_train < X.shape[1] + 1 or min_train >= n_rows:
+        raise ValueError("Not enough rows for the requested training window.")
+
+    if model == 'linear':
+        estimator = IncrementalLinearModel(X.shape[1])
+    else:
+        estimator = IncrementalForest(trees_per_refit=trees_per_refit)
+
+    # Rows currently inside the linear model's sufficient statistics
+    fitted_start, fitted_end = 0, 0
+
+    origins, targets, steps, previous, actual, predicted = [], [], [], [], [], []
+    for origin in range(min_train, n_rows, step):
+        start = origin - window_size if window == 'sliding' else 0
+        test_end = min(origin + horizon, n_rows)
+
+        if model == 'linear':
+            if fitted_end < origin:
+                estimator.add(X[fitted_end:origin], y[fitted_end:origin])
+                fitted_end = origin
+            if fitted_start < start:
+                estimator.remove(X[fitted_start:start], y[fitted_start:start])
+                fitted_start = start
+            estimator.solve()
+        else:
+            estimator.update(X[start:origin], y[start:origin])
+
+        # Lags known at the origin; later steps use the model's own predictions
+        y_pred = estimator.forecast(X[origin, :n_lags], X[origin:test_end, n_lags:])
+
+        origins.extend([dates[origin]] * len(y_pred))
+        targets.extend(dates[origin:test_end])
+        steps.extend(range(1, len(y_pred) + 1))
+        previous.extend([y[origin - 1]] * len(y_pred))
+        actual.extend(y[origin:test_end])
+        predicted.extend(y_pred)
+
+    results = pd.DataFrame({
+        "Origin": origins,
+        "Date": targets,
+        "Step": steps,
+        "Previous": previous,
+        "Actual": actual,
+        "Predicted": predicted,
+    })
+
+    overall = batch_metrics(results["Actual"].to_numpy(), results["Predicted"].to_numpy(),
+                            results["Previous"].to_numpy())
+
+    return overall["rmse"], overall["mae"], results
+
+
+def summarize_walk_forward(results):
+    """
+    RMSE, MAE, MAPE, directional accuracy and accuracy per forecast step of a
+    run_walk_forward results frame, scored in one pass over a (steps x origins) grid.
+    Direction is judged against the last price known at each origin.
+    """
+    grid = results.pivot(index="Step", columns="Origin", values=["Previous", "Actual", "Predicted"])
+    metrics = batch_metrics(grid["Actual"].to_numpy(), grid["Predicted"].to_numpy(), grid["Previous"].to_numpy())
+    return pd.DataFrame(metrics, index=grid.index)
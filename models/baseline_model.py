@@ -1,18 +1,15 @@
 
 from utils.metrics import calculate_rmse, calculate_mae
+from utils.features import find_price_col
+from utils.tracing import traced
 
+@traced()
 def run_naive_baseline(df):
     """
     Assumes next value equals current value (naive prediction).
     Accepts either 'Close' or 'Price' column for price data.
     """
-    price_col = None
-    for col in df.columns:
-        col_lower = col.lower()
-        if col_lower in ['close', 'price', 'closing price', 'adj close']:
-
-            price_col = col
-            break
+    price_col = find_price_col(df)
 
     if not price_col:
         raise ValueError("Dataset must contain a 'Close' or 'Price' column for price.")
@@ -0,0 +1,93 @@
+import numpy as np
+
+
+def companion_matrix(lag_coefs):
+    """
+    State-transition matrix of y_t = a_1 y_{t-1} + ... + a_n y_{t-n}.
+    The state is [y_{t-1}, ..., y_{t-n}]; the first row holds the coefficients.
+    """
+    lag_coefs = np.asarray(lag_coefs, dtype=float)
+    n_lags = len(lag_coefs)
+    A = np.zeros((n_lags, n_lags))
+    A[0] = lag_coefs
+    A[1:, :-1] = np.eye(n_lags - 1)
+    return A
+
+
+def impulse_response(lag_coefs, n_steps):
+    """
+    h_k = (A^k)[0, 0]: effect of a unit shock at step 0 on the forecast k steps later.
+    """
+    A = companion_matrix(lag_coefs)
+    h = np.empty(n_steps)
+    state = np.zeros(len(A))
+    state[0] = 1.0
+    for k in range(n_steps):
+        h[k] = state[0]
+        state = A @ state
+    return h
+
+
+def response_matrix(lag_coefs, n_steps):
+    """
+    Lower-triangular Toeplitz matrix G with G[t, s] = h_{t-s}, so that the whole
+    recursion over the horizon is y = G @ drive.
+    """
+    h = impulse_response(lag_coefs, n_steps)
+    offsets = np.subtract.outer(np.arange(n_steps), np.arange(n_steps))
+    return np.where(offsets >= 0, h[np.clip(offsets, 0, None)], 0.0)
+
+
+def history_matrix(lag_coefs, n_steps):
+    """
+    M[t, k]: weight of known lag_{k+1} (at forecast origin) on step t's driving term.
+    """
+    lag_coefs = np.asarray(lag_coefs, dtype=float)
+    n_lags = len(lag_coefs)
+    lag = np.add.outer(np.arange(n_steps), np.arange(n_lags)) + 1
+    return np.where(lag <= n_lags, lag_coefs[np.clip(lag, 1, n_lags) - 1], 0.0)
+
+
+def linear_recursion_forecast(intercept, lag_coefs, history, n_steps, exog=None, exog_coefs=None):
+    """
+    Closed-form multi-step forecast of a linear lag model
+        y_t = intercept + sum_i a_i y_{t-i} + exog_t . b
+    for every step of the horizon at once.
+
+    history: last observed prices in lag order (lag_1 first), shape (n_lags,) or
+             (n_paths, n_lags) to advance many paths together.
+    exog:    exogenous inputs per step, shape (n_steps, k) or (n_paths, n_steps, k).
+    Returns an array of shape (n_steps,) or (n_paths, n_steps).
+    """
+    history = np.asarray(history, dtype=float)
+    single = history.ndim == 1 and (exog is None or np.ndim(exog) < 3)
+    history = np.atleast_2d(history)
+
+    # Driving term for each step: intercept, exogenous inputs and the known history
+    drive = np.full((1, n_steps), float(intercept))
+    if exog is not None and exog_coefs is not None and len(exog_coefs):
+        exog = np.asarray(exog, dtype=float)
+        if exog.ndim == 2:
+            exog = exog[np.newaxis]
+        drive = drive + exog @ np.asarray(exog_coefs, dtype=float)
+    drive = drive + history @ history_matrix(lag_coefs, n_steps).T
+
+    forecast = drive @ response_matrix(lag_coefs, n_steps).T
+    return forecast[0] if single else forecast
+
+
+def bootstrap_paths(lag_coefs, base_path, residuals, n_paths, rng=None):
+    """
+    Simulated paths around a point forecast of the linear lag model.
+
+    Each step's shock is drawn (with replacement) from the centred in-sample residuals.
+    Since the recursion is linear, a path is the point forecast plus its shocks passed
+    through the response matrix, so all paths come from one matrix product:
+        paths = base_path + eps @ G.T
+    Returns an array of shape (n_paths, n_steps).
+    """
+    rng = np.random.default_rng(rng)
+    base_path = np.asarray(base_path, dtype=float)
+    residuals = np.asarray(residuals, dtype=float)
+    eps = rng.choice(residuals - residuals.mean(), size=(n_paths, len(base_path)))
+    return base_path + eps @ response_matrix(lag_coefs, len(base_path)).T
@@ -1,61 +1,108 @@
+import os
 import numpy as np
 import pandas as pd
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
 from sklearn.preprocessing import MinMaxScaler
+from config import LSTM_CHECKPOINT_DIR
 from utils.metrics import calculate_rmse, calculate_mae
+from utils.features import find_price_col, fingerprint
+from utils.tracing import traced
 
-def run_lstm_model(df, epochs=10, batch_size=32):
+
+def _import_tensorflow():
+    # Deferred so that importing this module (and starting the dashboard) stays fast
+    try:
+        import tensorflow as tf
+    except ImportError as e:
+        raise ImportError("The LSTM model needs TensorFlow: pip install tensorflow") from e
+    return tf
+
+
+def _window_dataset(tf, series, window, batch_size, shuffle=False):
+    """
+    Streaming tf.data pipeline of (previous 'window' prices -> next price) pairs.
     """
-    Trains an LSTM model to predict the next price value.
+    ds = tf.keras.utils.timeseries_dataset_from_array(
+        series[:-1], series[window:], sequence_length=window,
+        batch_size=batch_size, shuffle=shuffle, seed=42)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def _build_model(tf, window, units):
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(window, 1)),
+        tf.keras.layers.LSTM(units),
+        tf.keras.layers.Dense(1),
+    ])
+    model.compile(optimizer='adam', loss='mse')
+    return model
+
+
+@traced()
+def run_lstm_model(df, window=30, units=50, epochs=50, batch_size=64, patience=5,
+                   checkpoint_dir=LSTM_CHECKPOINT_DIR, return_model=False, data_key=None):
+    """
+    Trains an LSTM on windows of the previous 'window' prices to predict the next price.
     Accepts either 'Close' or 'Price' column for price data.
+    Uses the same chronological 80/20 split as the other models, with the last 10% of
+    the training windows held out for early stopping. Weights are checkpointed per
+    (data, window, units) and reloaded on the next run to warm-start training.
+    data_key identifies the data (and inputs) for the checkpoint; it defaults to a
+    fingerprint of df, so one dataset never warm-starts from another's weights.
     """
+    tf = _import_tensorflow()
+
     # 1. Identify price column
-    price_col = None
-    for col in df.columns:
-        col_lower = col.lower()
-        if col_lower in ['close', 'price', 'closing price', 'adj close']:
-            price_col = col
-            break
+    price_col = find_price_col(df)
 
     if not price_col:
         raise ValueError("Dataset must contain a 'Close' or 'Price' column for price.")
 
-    prices = df[price_col].values.reshape(-1, 1)
+    prices = df[price_col].to_numpy(dtype=float)
+    n_samples = len(prices) - window
+    if n_samples < 10:
+        raise ValueError(f"Dataset needs more than {window + 10} rows for a {window}-step LSTM.")
 
-    # 2. Normalize prices for faster training
-    scaler = MinMaxScaler()
-    prices_scaled = scaler.fit_transform(prices)
+    # 2. Chronological split on the target index: train / validation / test
+    split_index = int(n_samples * 0.8)
+    val_index = int(split_index * 0.9)
 
-    # 3. Prepare sequences (X: previous step, y: next step)
-    X, y = [], []
-    for i in range(len(prices_scaled) - 1):
-        X.append(prices_scaled[i])
-        y.append(prices_scaled[i + 1])
-
-    X = np.array(X)
-    y = np.array(y)
+    # 3. Scale with statistics from the training period only
+    scaler = MinMaxScaler()
+    scaler.fit(prices[:val_index + window].reshape(-1, 1))
+    scaled = scaler.transform(prices.reshape(-1, 1)).astype(np.float32)
 
-    X = X.reshape((X.shape[0], 1, X.shape[1]))  # LSTM expects 3D input
+    train_ds = _window_dataset(tf, scaled[:val_index + window], window, batch_size, shuffle=True)
+    val_ds = _window_dataset(tf, scaled[val_index:split_index + window], window, batch_size)
+    test_ds = _window_dataset(tf, scaled[split_index:], window, batch_size)
 
-    # 4. Build model
-    model = Sequential()
-    model.add(LSTM(50, activation='relu', input_shape=(X.shape[1], X.shape[2])))
-    model.add(Dense(1))
-    model.compile(optimizer='adam', loss='mse')
+    # 4. Build model, warm-starting from earlier weights when available
+    model = _build_model(tf, window, units)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    data_key = (data_key or fingerprint(df))[:16]
+    checkpoint_path = os.path.join(checkpoint_dir, f"lstm_{data_key}_w{window}_u{units}.weights.h5")
+    if os.path.exists(checkpoint_path):
+        try:
+            model.load_weights(checkpoint_path)
+        except Exception as e:
+            print(f"[Ignoring LSTM checkpoint] {e}")
 
-    # 5. Train
-    model.fit(X, y, epochs=epochs, batch_size=batch_size, verbose=1)
+    # 5. Train with early stopping
+    callbacks = [
+        tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=patience, restore_best_weights=True),
+        tf.keras.callbacks.ModelCheckpoint(checkpoint_path, monitor='val_loss', save_best_only=True,
+                                           save_weights_only=True),
+    ]
+    model.fit(train_ds, validation_data=val_ds, epochs=epochs, callbacks=callbacks, verbose=0)
 
-    # 6. Predict
-    y_pred_scaled = model.predict(X)
+    # 6. Predict the test period and inverse scale to original prices
+    y_pred = scaler.inverse_transform(model.predict(test_ds, verbose=0)).flatten()
+    y_test = pd.Series(prices[split_index + window:], index=df.index[split_index + window:], name=price_col)
 
-    # 7. Inverse scale to original prices
-    actual = scaler.inverse_transform(y)
-    predicted = scaler.inverse_transform(y_pred_scaled)
+    # 7. Calculate metrics
+    rmse = calculate_rmse(y_test, y_pred)
+    mae = calculate_mae(y_test, y_pred)
 
-    # 8. Calculate metrics
-    rmse = calculate_rmse(actual.flatten(), predicted.flatten())
-    mae = calculate_mae(actual.flatten(), predicted.flatten())
+    if return_model:
+        return rmse, mae, y_test, y_pred, model
 
-    return rmse, mae, actual.flatten(), predicted.flatten()
+    return rmse, mae, y_test, y_pred
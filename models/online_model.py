@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+from utils.metrics import calculate_rmse, calculate_mae
+from utils.features import build_lag_features
+from utils.macro_registry import asof_align, make_series
+from models.forecasting import linear_recursion_forecast
+from utils.tracing import traced
+
+
+class RecursiveLeastSquares:
+    """
+    Linear regression updated one observation at a time.
+
+    Keeps the coefficients and P, the inverse of the (discounted) X'X, so each update
+    costs O(features^2) however many rows came before. With forgetting < 1 every past
+    row's weight shrinks by that factor per update, letting the fit follow regime
+    changes (0.99 gives the last ~100 rows most of the weight).
+    """
+
+    def __init__(self, n_features, forgetting=1.0, delta=1e4):
+        if not 0 < forgetting <= 1:
+            raise ValueError("forgetting must be in (0, 1].")
+        self.forgetting = forgetting
+        # Prior variance of the coefficients; keeps P invertible before the data pins
+        # every direction down (e.g. a feature that has been constant so far)
+        self.delta = delta
+        self.coef = np.zeros(n_features + 1)
+        self.P = np.eye(n_features + 1) * delta
+        self.n_updates = 0
+
+    @property
+    def intercept_(self):
+        return self.coef[0]
+
+    @property
+    def coef_(self):
+        return self.coef[1:]
+
+    def fit(self, X, y):
+        """
+        Starts from the weighted least-squares fit on a batch of rows, the same state
+        row-by-row updates from the prior would reach (with forgetting=1 it matches
+        LinearRegression up to the tiny 1/delta ridge).
+        """
+        X = np.column_stack([np.ones(len(X)), X])
+        weighted = X * (self.forgetting ** np.arange(len(X) - 1, -1, -1, dtype=float))[:, None]
+        self.P = np.linalg.inv(weighted.T @ X + np.eye(X.shape[1]) / self.delta)
+        self.coef = self.P @ (weighted.T @ y)
+        self.n_updates = len(X)
+        return self
+
+    def predict(self, X):
+        return np.asarray(X, dtype=float) @ self.coef[1:] + self.coef[0]
+
+    def update(self, x, y):
+        """
+        Adds one observation (x, y) and returns the prediction made before seeing y.
+        """
+        x = np.concatenate(([1.0], np.asarray(x, dtype=float)))
+        prediction = x @ self.coef
+        Px = self.P @ x
+        gain = Px / (self.forgetting + x @ Px)
+        self.coef = self.coef + gain * (y - prediction)
+        self.P = (self.P - np.outer(gain, Px)) / self.forgetting
+        # Keep P symmetric against rounding drift
+        self.P = (self.P + self.P.T) / 2
+        self.n_updates += 1
+        return prediction
+
+
+class OnlineForecaster:
+    """
+    The lag/inflation linear model kept up to date tick by tick.
+
+    update() feeds one new price through RecursiveLeastSquares and shifts the lag
+    state; forecast() runs the closed-form recursion from that state. Neither looks
+    at the price history, so a tick costs the same on ten years of data as on one.
+    Exogenous features (inflation, registered macros) take their latest value at or
+    before each date, as in the batch model.
+    """
+
+    def __init__(self, model, n_lags, history, exog_series, last_exog, last_date):
+        self.model = model
+        self.n_lags = n_lags
+        self.history = np.asarray(history, dtype=float)
+        self.exog_series = exog_series
+        self.last_exog = np.asarray(last_exog, dtype=float)
+        self.last_date = last_date
+
+    @classmethod
+    def from_history(cls, df, inflation_df=None, n_lags=5, forgetting=1.0, macros=None):
+        features = build_lag_features(df, inflation_df, n_lags, macros)
+        model = RecursiveLeastSquares(features.X.shape[1], forgetting).fit(features.X, features.y)
+
+        # The exogenous series in feature order, for as-of lookups on later ticks:
+        # the inflation column first, then one per registered macro, as build_lag_features lays them out
+        exog_cols = features.feature_cols[n_lags:]
+        exog_series = []
+        if exog_cols[:1] == ['Inflation'] and inflation_df is not None:
+            exog_series.append(make_series('Inflation', inflation_df['Date'], inflation_df['Inflation']))
+        if macros is not None:
+            exog_series.extend(macros.series[name] for name in exog_cols[len(exog_series):])
+        if len(exog_series) != len(exog_cols):
+            raise ValueError(f"Expected {len(exog_cols)} exogenous series, found {len(exog_series)}.")
+
+        history = df[features.price_col].to_numpy(dtype=float)[-n_lags:][::-1]
+        last_date = df['Date'].max() if 'Date' in df.columns else pd.Timestamp.today()
+        return cls(model, n_lags, history, exog_series, features.X[-1, n_lags:], last_date)
+
+    def exog_at(self, dates):
+        # (len(dates), k) latest value of every exogenous series at each date
+        dates = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+        return np.column_stack([asof_align(dates, series, backfill=True) for series in self.exog_series]
+                               or [np.empty((len(dates), 0))])
+
+    def predict_next(self, exog=None):
+        """
+        One-step forecast of the next price from the current lag state.
+        """
+        exog = self.last_exog if exog is None else np.asarray(exog, dtype=float)
+        return float(self.model.predict(np.concatenate((self.history, exog))[None])[0])
+
+    def update(self, price, date=None, exog=None):
+        """
+        Adds one new price; returns what the model predicted for it beforehand.
+        Without exog, the exogenous features are looked up as of 'date' (or kept from
+        the previous tick when no date is given).
+        """
+        if exog is not None:
+            exog = np.asarray(exog, dtype=float)
+        elif date is not None and self.exog_series:
+            exog = self.exog_at([date])[0]
+        else:
+            exog = self.last_exog
+
+        prediction = self.model.update(np.concatenate((self.history, exog)), float(price))
+        self.history = np.concatenate(([float(price)], self.history[:-1]))
+        self.last_exog = exog
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+        return prediction
+
+    def forecast(self, n_months=12):
+        months = [self.last_date + pd.DateOffset(months=i + 1) for i in range(n_months)]
+        exog = self.exog_at(months) if self.exog_series else None
+        prices = linear_recursion_forecast(self.model.intercept_, self.model.coef_[:self.n_lags], self.history,
+                                           n_months, exog=exog, exog_coefs=self.model.coef_[self.n_lags:])
+        return pd.DataFrame({"Month": months, "Forecasted Price": prices})
+
+
+@traced()
+def run_online_regression(df, inflation_df=None, n_lags=5, forgetting=0.99, return_model=False, macros=None):
+    """
+    Online linear model scored like run_linear_regression: fitted on the first 80%,
+    then each test price is predicted before it is used to update the model.
+    """
+    features = build_lag_features(df, inflation_df, n_lags, macros)
+    split_index = int(len(features.y) * 0.8)
+
+    model = RecursiveLeastSquares(features.X.shape[1], forgetting)
+    model.fit(features.X[:split_index], features.y[:split_index])
+
+    y_pred = np.array([model.update(x, y) for x, y in zip(features.X[split_index:], features.y[split_index:])])
+    y_test = pd.Series(features.y[split_index:], index=features.index[split_index:], name=features.price_col)
+
+    rmse = calculate_rmse(y_test, y_pred)
+    mae = calculate_mae(y_test, y_pred)
+
+    if return_model:
+        return rmse, mae, y_test, y_pred, model
+
+    return rmse, mae, y_test, y_pred
@@ -1,50 +1,33 @@
 from sklearn.ensemble import RandomForestRegressor
 from utils.metrics import calculate_rmse, calculate_mae
+from utils.features import build_lag_features
+from utils.tracing import traced
 import pandas as pd
 
-def run_random_forest(df, inflation_df=None, n_lags=5):
+@traced()
+def run_random_forest(df, inflation_df=None, n_lags=5, return_model=False, n_estimators=100, max_depth=None,
+                      max_features=1.0, max_samples=None, n_jobs=-1, macros=None):
     """
     Train a Random Forest model on lagged closing prices and return predictions and metrics.
     Includes option for inflation rate
+    Tree parameters default to the untuned forest (see models.tuning for a search).
+    Trees are fitted on all cores; pass n_jobs=1 when already running inside a process pool.
+    'macros' (a MacroRegistry) adds its series as features.
     """
 
-    # Find the appropriate column for price
-    price_col = None
-    for col in df.columns:
-        if col.lower() in ['close', 'price', 'adj close']:
-            price_col = col
-            break
-
-    if not price_col:
-        raise ValueError("Dataset must contain a 'Close' or 'Price' column.")
-
-    # Inflation
-    if inflation_df is not None and 'Date' in df.columns:
-        df = pd.merge(df, inflation_df, on='Date', how='left')
-        df['Inflation'].fillna(method='ffill', inplace=True)
-        df['Inflation'].fillna(method='bfill', inplace=True)
-
-    # Create lag features
-    data = df[price_col].copy()
-    for i in range(1, n_lags + 1):
-        df[f'lag_{i}'] = data.shift(i)
-
-    df.dropna(inplace=True)
-
-    feature_cols = [f'lag_{i}' for i in range(1, n_lags + 1)]
-    if 'Inflation' in df.columns:
-        feature_cols.append('Inflation')
-
-    X = df[feature_cols]
-    y = df[price_col]
+    # Lag features (+ inflation) shared with the other models
+    features = build_lag_features(df, inflation_df, n_lags, macros)
+    X = features.X
+    y = pd.Series(features.y, index=features.index, name=features.price_col)
 
     # Train/test split
-    split_index = int(len(df) * 0.8)
+    split_index = int(len(y) * 0.8)
     X_train, X_test = X[:split_index], X[split_index:]
     y_train, y_test = y[:split_index], y[split_index:]
 
     # Train model
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
+    model = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, max_features=max_features,
+                                  max_samples=max_samples, random_state=42, n_jobs=n_jobs)
     model.fit(X_train, y_train)
 
     # Predict
@@ -54,4 +37,7 @@ def run_random_forest(df, inflation_df=None, n_lags=5):
     rmse = calculate_rmse(y_test, y_pred)
     mae = calculate_mae(y_test, y_pred)
 
+    if return_model:
+        return rmse, mae, y_test, y_pred, model
+
     return rmse, mae, y_test, y_pred
@@ -1,51 +1,30 @@
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 from utils.metrics import calculate_rmse, calculate_mae
-import numpy as np
+from utils.features import build_lag_features
+from utils.macro_registry import asof_align, make_series
+from models.forecasting import bootstrap_paths, linear_recursion_forecast
+from utils.tracing import traced
 
-def run_linear_regression(df, inflation_df=None, n_lags=5):
+@traced()
+def run_linear_regression(df, inflation_df=None, n_lags=5, return_model=False, macros=None):
     """
     Uses previous 'n_lags' prices to predict the next price.
     Accepts columns named 'Close', 'Price', or similar.
     Includes inflation rate 
+    and any series registered in 'macros' (a MacroRegistry)
     """
 
-    # Try to locate the correct price column
-    price_col = None
-    for col in df.columns:
-        col_lower = col.lower()
-        if col_lower in ['close', 'price', 'adj close', 'closing price']:
-            price_col = col
-            break
-
-    if not price_col:
-        raise ValueError("Dataset must contain a column named 'Close', 'Price', or similar.")
-
-    data = df[price_col].copy()
-
-    if inflation_df is not None and 'Date' in df.columns:
-        df = pd.merge(df, inflation_df, on='Date', how='left')
-        df['Inflation'].fillna(method='ffill', inplace=True)
-        df['Inflation'].fillna(method='bfill', inplace=True)
-
-    # Create lag features
-    for i in range(1, n_lags + 1):
-        df[f'lag_{i}'] = data.shift(i)
-
-    df.dropna(inplace=True)
-
     # Features: lag_1 to lag_n
-    # and inflation
-    feature_cols = [f'lag_{i}' for i in range(1, n_lags + 1)]
-    if 'Inflation' in df.columns:
-        feature_cols.append('Inflation')
-
-    X = df[feature_cols]
-    y = df[price_col]
+    # and inflation, macros
+    features = build_lag_features(df, inflation_df, n_lags, macros)
+    X = features.X
+    y = pd.Series(features.y, index=features.index, name=features.price_col)
 
 
     # Train/test split (80/20)
-    split_index = int(len(df) * 0.8)
+    split_index = int(len(y) * 0.8)
     X_train, X_test = X[:split_index], X[split_index:]
     y_train, y_test = y[:split_index], y[split_index:]
 
@@ -60,61 +39,117 @@ def run_linear_regression(df, inflation_df=None, n_lags=5):
     rmse = calculate_rmse(y_test, y_pred)
     mae = calculate_mae(y_test, y_pred)
 
+    if return_model:
+        return rmse, mae, y_test, y_pred, model
+
     return rmse, mae, y_test, y_pred
 
-def forecast_future_prices(df, inflation_df=None, n_lags=5, n_months=12):
+@traced()
+def fit_forecast_model(df, inflation_df=None, n_lags=5, macros=None):
     """
-    Forecast future prices using the trained linear regression model.
+    Fits the linear lag model on the full history for forecasting.
     """
-    price_col = None
-    for col in df.columns:
-        if col.lower() in ['close', 'price', 'adj close', 'closing price']:
-            price_col = col
-            break
+    features = build_lag_features(df, inflation_df, n_lags, macros)
 
-    if not price_col:
-        raise ValueError("Dataset must contain a column named 'Close', 'Price', or similar.")
+    model = LinearRegression()
+    model.fit(features.X, features.y)
 
-    df = df.copy()
+    return model, features
 
-    if inflation_df is not None and 'Date' in df.columns:
-        df = pd.merge(df, inflation_df, on='Date', how='left')
-        df['Inflation'].fillna(method='ffill', inplace=True)
-        df['Inflation'].fillna(method='bfill', inplace=True)
 
-    data = df[price_col].copy()
+def _future_months(df, n_months):
     latest_date = df['Date'].max() if 'Date' in df.columns else pd.Timestamp.today()
+    return [latest_date + pd.DateOffset(months=i + 1) for i in range(n_months)]
+
 
-    for i in range(1, n_lags + 1):
-        df[f'lag_{i}'] = data.shift(i)
+def _future_exog(features, months, inflation_df=None, macros=None):
+    """
+    Exogenous feature values for future months: the latest observation at or before
+    each month, so months past the end of a series hold its last value.
+    """
+    columns = []
+    if 'Inflation' in features.feature_cols:
+        series = make_series('Inflation', inflation_df['Date'], inflation_df['Inflation'])
+        columns.append(asof_align(months, series, backfill=True))
+    if macros is not None and len(macros):
+        aligned = macros.align(np.asarray(months, dtype='datetime64[ns]'))
+        columns.extend(aligned[name].to_numpy() for name in aligned.columns if name in features.feature_cols)
+    return np.column_stack(columns) if columns else None
 
-    df.dropna(inplace=True)
 
-    feature_cols = [f'lag_{i}' for i in range(1, n_lags + 1)]
-    if 'Inflation' in df.columns:
-        feature_cols.append('Inflation')
+def _last_prices(df, features, n_lags):
+    # Most recent observed prices in lag order (lag_1 first)
+    return df[features.price_col].to_numpy(dtype=float)[-n_lags:][::-1]
 
-    X = df[feature_cols]
-    y = df[price_col]
 
-    model = LinearRegression()
-    model.fit(X, y)
+@traced()
+def forecast_future_prices(df, inflation_df=None, n_lags=5, n_months=12, model=None, macros=None):
+    """
+    Forecast future prices using the trained linear regression model.
+    The recursion is solved for the whole horizon in one pass (see models.forecasting).
+    Pass a model from fit_forecast_model to skip refitting.
+    """
+    if model is None:
+        model, features = fit_forecast_model(df, inflation_df, n_lags, macros)
+    else:
+        features = build_lag_features(df, inflation_df, n_lags, macros)
+    months = _future_months(df, n_months)
 
-    future_prices = []
-    last_known = df.iloc[-1]
-    inflation_values = inflation_df.set_index('Date')['Inflation'] if inflation_df is not None else None
+    exog = _future_exog(features, months, inflation_df, macros)
+    prices = linear_recursion_forecast(model.intercept_, model.coef_[:n_lags], _last_prices(df, features, n_lags),
+                                       n_months, exog=exog, exog_coefs=model.coef_[n_lags:])
 
-    lags = [last_known[f'lag_{i}'] for i in range(1, n_lags + 1)]
+    return pd.DataFrame({"Month": months, "Forecasted Price": prices})
 
-    for i in range(n_months):
-        next_features = lags[-n_lags:]
-        if inflation_values is not None:
-            future_month = latest_date + pd.DateOffset(months=i+1)
-            next_inflation = inflation_values.get(future_month, inflation_values.ffill().iloc[-1])
-            next_features = next_features + [next_inflation]
 
-        next_price = model.predict([next_features])[0]
-        future_prices.append((latest_date + pd.DateOffset(months=i+1), next_price))
-        lags.append(next_price)
+@traced()
+def forecast_price_intervals(df, inflation_df=None, n_lags=5, n_months=12, n_paths=10000, quantiles=(5, 50, 95),
+                             model=None, macros=None, random_state=42):
+    """
+    Point forecast plus bootstrap bands: n_paths recursive paths are simulated by
+    resampling the model's in-sample residuals, and one column per quantile
+    (named like '5%') is added to the forecast_future_prices frame.
+    """
+    if model is None:
+        model, features = fit_forecast_model(df, inflation_df, n_lags, macros)
+    else:
+        features = build_lag_features(df, inflation_df, n_lags, macros)
+    forecast = forecast_future_prices(df, inflation_df, n_lags, n_months, model=model, macros=macros)
+
+    residuals = features.y - model.predict(features.X)
+    paths = bootstrap_paths(model.coef_[:n_lags], forecast["Forecasted Price"].to_numpy(), residuals,
+                            n_paths, rng=random_state)
+    for q, band in zip(quantiles, np.percentile(paths, quantiles, axis=0)):
+        forecast[f"{q:g}%"] = band
+
+    return forecast
 
-    return pd.DataFrame(future_prices, columns=["Month", "Forecasted Price"])
\ No newline at end of file
+
+@traced()
+def forecast_price_scenarios(df, inflation_paths, inflation_df=None, n_lags=5, model=None, macros=None):
+    """
+    Forecasts one price path per inflation trajectory in a single batched computation.
+    inflation_paths has shape (n_scenarios, n_months); returns a frame indexed by Month
+    with one column per scenario. Other macro features follow their latest values.
+    """
+    if model is None:
+        model, features = fit_forecast_model(df, inflation_df, n_lags, macros)
+    else:
+        features = build_lag_features(df, inflation_df, n_lags, macros)
+    if 'Inflation' not in features.feature_cols:
+        raise ValueError("Inflation scenarios need a model trained with inflation data.")
+
+    inflation_paths = np.atleast_2d(np.asarray(inflation_paths, dtype=float))
+    n_months = inflation_paths.shape[1]
+    months = _future_months(df, n_months)
+
+    # Inflation is the first exogenous column; the macros after it are shared by every path
+    exog = inflation_paths[:, :, None]
+    others = _future_exog(features, months, inflation_df, macros)[:, 1:]
+    if others.shape[1]:
+        exog = np.concatenate([exog, np.broadcast_to(others, (len(inflation_paths),) + others.shape)], axis=2)
+
+    prices = linear_recursion_forecast(model.intercept_, model.coef_[:n_lags], _last_prices(df, features, n_lags),
+                                       n_months, exog=exog, exog_coefs=model.coef_[n_lags:])
+
+    return pd.DataFrame(prices.T, index=pd.Index(months, name="Month"))
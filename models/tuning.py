@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, TimeSeriesSplit
+from sklearn.pipeline import Pipeline
+from utils.features import build_lag_features
+from utils.tracing import traced
+
+DEFAULT_FOREST_GRID = {
+    'lags__n_lags': [3, 5, 10, 20],
+    'forest__max_depth': [None, 8, 16],
+    'forest__max_features': [1.0, 0.5, 'sqrt'],
+    'forest__max_samples': [None, 0.5],
+}
+
+
+class LagSelector(BaseEstimator, TransformerMixin):
+    """
+    Keeps the first n_lags lag columns of a matrix built with max_lags lags, plus any
+    exogenous columns after them, so n_lags can be searched like any other parameter.
+    """
+
+    def __init__(self, n_lags=5, max_lags=5):
+        self.n_lags = n_lags
+        self.max_lags = max_lags
+
+    def fit(self, X, y=None):
+        if self.n_lags > self.max_lags:
+            raise ValueError(f"n_lags={self.n_lags} exceeds the {self.max_lags} lags that were built.")
+        return self
+
+    def transform(self, X):
+        X = np.asarray(X)
+        return np.hstack([X[:, :self.n_lags], X[:, self.max_lags:]])
+
+
+@traced()
+def tune_random_forest(df, inflation_df=None, param_grid=None, n_splits=5, max_estimators=300,
+                       min_estimators='exhaust', factor=3, n_jobs=-1, macros=None):
+    """
+    Successive-halving grid search for run_random_forest over time-ordered folds.
+
+    The tree count is the halving resource: every candidate starts with a few trees,
+    and only the best 1/factor of them move on with factor times more, up to
+    max_estimators. Each fold trains on the past and scores on the following block
+    (TimeSeriesSplit), on the first 80% of the data so the test split stays unseen.
+    All candidates share one feature matrix built with the largest n_lags.
+
+    Returns a dict with best_params (keyword arguments for run_random_forest),
+    best_rmse (mean CV RMSE), n_candidates, n_fits, seconds and the per-candidate
+    results frame.
+    """
+    param_grid = dict(param_grid or DEFAULT_FOREST_GRID)
+    max_lags = max(param_grid.get('lags__n_lags', [5]))
+
+    features = build_lag_features(df, inflation_df, max_lags, macros)
+    split_index = int(len(features.y) * 0.8)
+    X, y = features.X[:split_index], features.y[:split_index]
+
+    # Trees run one per core through the search; the forests themselves stay single-threaded
+    pipeline = Pipeline([
+        ('lags', LagSelector(max_lags=max_lags)),
+        ('forest', RandomForestRegressor(random_state=42, n_jobs=1)),
+    ])
+    search = HalvingGridSearchCV(
+        pipeline, param_grid, cv=TimeSeriesSplit(n_splits=n_splits),
+        scoring='neg_root_mean_squared_error', resource='forest__n_estimators',
+        max_resources=max_estimators, min_resources=min_estimators, factor=factor,
+        refit=False, n_jobs=n_jobs, random_state=42)
+
+    start = time.perf_counter()
+    search.fit(X, y)
+    seconds = time.perf_counter() - start
+
+    best = search.best_params_
+    best_params = {
+        'n_lags': best.get('lags__n_lags', max_lags),
+        'n_estimators': int(best['forest__n_estimators']),
+        'max_depth': best.get('forest__max_depth'),
+        'max_features': best.get('forest__max_features', 1.0),
+        'max_samples': best.get('forest__max_samples'),
+    }
+
+    results = pd.DataFrame(search.cv_results_)
+    results = pd.DataFrame({
+        'iteration': results['iter'],
+        'n_estimators': results['n_resources'],
+        'params': results['params'],
+        'rmse': -results['mean_test_score'],
+        'fit_seconds': results['mean_fit_time'],
+    }).sort_values(['iteration', 'rmse'], ascending=[False, True]).reset_index(drop=True)
+
+    return {
+        'best_params': best_params,
+        'best_rmse': float(-search.best_score_),
+        'n_candidates': int(search.n_candidates_[0]),
+        'n_fits': len(results) * n_splits,
+        'seconds': seconds,
+        'results': results,
+    }
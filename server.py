@@ -0,0 +1,273 @@
+# server.py
+"""
+Local prediction service so other tools can get forecasts without the dashboard.
+
+    python server.py --port 8765
+
+Endpoints (JSON bodies, localhost only by default):
+    GET  /health
+    POST /load      {"path": "...csv", "inflation_path": "...csv"}
+    POST /run       {"model": "linear"}               -> rmse, mae, test rows
+    POST /forecast  {"months": 12}                    -> [{"Month", "Forecasted Price"}]
+    POST /predict   {"model": "linear", "features": [[lag_1, ..., lag_n, (Inflation)], ...]}
+
+Fitted models stay warm in the controller's cache between requests, and concurrent
+/predict calls for the same model are coalesced into one batched predict(). With
+--artifacts DIR, /predict loads models trained earlier on the same data from that store
+instead of refitting them.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from controllers.prediction_controller import FITTED_MODELS, PredictionController
+
+
+class MicroBatcher:
+    """
+    Collects predict requests that arrive within max_wait seconds of each other and
+    answers them with a single call to predict_fn on the stacked rows.
+    close() stops the worker thread, which releases predict_fn and its model.
+    """
+
+    STOP = object()
+
+    def __init__(self, predict_fn, n_features=None, max_wait=0.002, max_batch=4096):
+        self.predict_fn = predict_fn
+        self.n_features = n_features
+        self.max_wait = max_wait
+        self.max_batch = max_batch
+        self.requests = queue.Queue()
+        self.closed = False
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        # Requests already queued are still answered before the worker exits
+        with self.lock:
+            self.closed = True
+            self.requests.put(self.STOP)
+
+    def predict(self, rows):
+        request = {"rows": np.atleast_2d(np.asarray(rows, dtype=float)), "done": threading.Event()}
+        # Reject malformed rows here so they cannot fail the rest of a shared batch
+        if self.n_features is not None and request["rows"].shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features per row, got {request['rows'].shape[1]}.")
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("The model was replaced by a new /load; retry the request.")
+            self.requests.put(request)
+        request["done"].wait()
+        if "error" in request:
+            raise request["error"]
+        return request["result"]
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            request = self.requests.get()
+            if request is self.STOP:
+                break
+            batch = [request]
+            size = len(batch[0]["rows"])
+            deadline = time.perf_counter() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is self.STOP:
+                    stopping = True
+                    break
+                batch.append(request)
+                size += len(request["rows"])
+
+            try:
+                predictions = self.predict_fn(np.vstack([request["rows"] for request in batch]))
+                splits = np.cumsum([len(request["rows"]) for request in batch])[:-1]
+                for request, result in zip(batch, np.split(predictions, splits)):
+                    request["result"] = result
+            except Exception as e:
+                for request in batch:
+                    request["error"] = e
+            for request in batch:
+                request["done"].set()
+
+
+class PredictionService:
+    """
+    Request handlers on top of one PredictionController.
+    """
+
+    def __init__(self, controller=None):
+        self.controller = controller or PredictionController()
+        self.batchers = {}
+        self.lock = threading.Lock()
+        # Bumped by every /load, so a model fitted on the previous dataset is not served
+        self.generation = 0
+
+    def load(self, body):
+        with self.lock:
+            if body.get("inflation_path"):
+                self.controller.load_inflation_data(body["inflation_path"])
+            data = self.controller.load_dataset(body["path"])
+            for batcher in self.batchers.values():
+                batcher.close()
+            self.batchers.clear()
+            self.generation += 1
+        if data is None:
+            raise ValueError(f"Failed to load {body['path']}")
+        return {"rows": len(data), "columns": list(data.columns),
+                "inflation": self.controller.inflation_df is not None}
+
+    def run(self, body):
+        model = body.get("model", "linear")
+        runners = {
+            "baseline": self.controller.run_baseline_model,
+            "linear": self.controller.run_linear_regression_model,
+            "random_forest": self.controller.run_random_forest_model,
+        }
+        if model not in runners:
+            raise ValueError(f"Unknown model '{model}'.")
+        rmse, mae, y_test, y_pred = runners[model]()
+        return {"model": model, "rmse": float(rmse), "mae": float(mae),
+                "test_rows": 0 if y_test is None else len(y_test)}
+
+    def forecast(self, body):
+        forecast = self.controller.forecast_next_months(int(body.get("months", 12)))
+        # The point forecast plus its bootstrap band columns ('5%', '50%', '95%')
+        return [dict({"Month": row["Month"].strftime("%Y-%m-%d")},
+                     **{col: float(row[col]) for col in forecast.columns if col != "Month"})
+                for _, row in forecast.iterrows()]
+
+    def predict(self, body):
+        model = body.get("model", "linear")
+        if model not in FITTED_MODELS:
+            raise ValueError(f"Unknown model '{model}'; /predict serves {', '.join(FITTED_MODELS)}.")
+        n_lags = int(body.get("n_lags", 5))
+        key = (model, n_lags)
+        with self.lock:
+            if self.controller.data is None:
+                raise ValueError("Load a dataset first.")
+            batcher = self.batchers.get(key)
+            generation = self.generation
+
+        if batcher is None:
+            # Fitting can take a while (forests); other requests and /load go on meanwhile
+            estimator = self.controller.fitted_model(model, n_lags)
+            with self.lock:
+                if generation != self.generation:
+                    raise RuntimeError("The dataset was replaced by a new /load; retry the request.")
+                batcher = self.batchers.get(key)
+                if batcher is None:
+                    batcher = MicroBatcher(estimator.predict, getattr(estimator, "n_features_in_", None))
+                    self.batchers[key] = batcher
+        return {"model": model, "predictions": batcher.predict(body["features"]).tolist()}
+
+
+def make_handler(service):
+    routes = {
+        "/load": service.load,
+        "/run": service.run,
+        "/forecast": service.forecast,
+        "/predict": service.predict,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, {"status": "ok", "dataset_loaded": service.controller.data is not None})
+            else:
+                self._reply(404, {"error": f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path not in routes:
+                self._reply(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                self._reply(200, routes[self.path](body))
+            except Exception as e:
+                self._reply(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for bursts of concurrent clients before connections are refused
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=8765, controller=None):
+    return ServiceHTTPServer((host, port), make_handler(PredictionService(controller)))
+
+
+class ServiceClient:
+    """
+    Minimal client for scripts and tests talking to a local server.
+    """
+
+    def __init__(self, url="http://127.0.0.1:8765"):
+        self.url = url.rstrip("/")
+
+    def call(self, path, payload=None):
+        data = None if payload is None else json.dumps(payload).encode()
+        request = urllib.request.Request(self.url + path, data=data, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+    def load(self, path, inflation_path=None):
+        return self.call("/load", {"path": path, "inflation_path": inflation_path})
+
+    def run(self, model="linear"):
+        return self.call("/run", {"model": model})
+
+    def forecast(self, months=12):
+        return self.call("/forecast", {"months": months})
+
+    def predict(self, features, model="linear"):
+        return self.call("/predict", {"model": model, "features": features})["predictions"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PredictionController over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--artifacts", help="Artifact store directory for fitted models.")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, PredictionController(artifact_dir=args.artifacts))
+    print(f"Prediction service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from models.backtest import run_walk_forward, summarize_walk_forward
+
+
+def random_walk_prices(n_rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2000-01-01', periods=n_rows, freq='D')
+    return pd.DataFrame({'Date': dates, 'Close': 60 + np.cumsum(rng.normal(0, 1, n_rows))})
+
+
+def test_multi_step_error_grows_with_step():
+    _, _, results = run_walk_forward(random_walk_prices(), model='linear', horizon=20, step=5, min_train=300)
+    rmse = summarize_walk_forward(results)['rmse']
+    # A random walk's h-step error grows like sqrt(h); one-step forecasts in disguise stay flat
+    assert rmse.loc[20] > 2 * rmse.loc[1]
+
+
+def test_first_step_matches_one_step_backtest():
+    df = random_walk_prices()
+    _, _, multi = run_walk_forward(df, model='linear', horizon=5, step=5, min_train=300)
+    _, _, single = run_walk_forward(df, model='linear', horizon=1, step=5, min_train=300)
+    first = multi[multi['Step'] == 1].reset_index(drop=True)
+    np.testing.assert_allclose(first['Predicted'], single['Predicted'])
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from controllers.prediction_controller import PredictionController
+
+
+def test_models_are_ranked_on_the_same_rows(tmp_path):
+    rng = np.random.default_rng(0)
+    path = tmp_path / 'prices.csv'
+    pd.DataFrame({'Date': pd.date_range('2010-01-01', periods=400, freq='D').strftime('%Y-%m-%d'),
+                  'Close': (60 + np.cumsum(rng.normal(0, 1, 400))).round(2)}).to_csv(path, index=False)
+    controller = PredictionController()
+    controller.load_dataset(str(path))
+
+    leaderboard, results = controller.compare_models(("baseline", "linear", "random_forest", "online"))
+
+    assert leaderboard["Error"].isna().all()
+    indexes = [y_test.index for y_test, _ in results.values()]
+    assert all(index.equals(indexes[0]) for index in indexes)
+    assert (leaderboard["Test Rows"] == len(indexes[0])).all()
+
+    # The baseline is scored on the lag models' rows: each prediction is the previous price
+    y_test, y_pred = results["baseline"]
+    np.testing.assert_allclose(y_pred, controller.data["Close"].shift(1).loc[y_test.index])
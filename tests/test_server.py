@@ -0,0 +1,39 @@
+import os
+import threading
+import urllib.error
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from server import ServiceClient, make_server
+
+
+@pytest.fixture
+def client(tmp_path):
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame({'Date': pd.date_range('2010-01-01', periods=300, freq='D').strftime('%Y-%m-%d'),
+                           'Close': (60 + np.cumsum(rng.normal(0, 1, 300))).round(2)})
+    path = os.path.join(tmp_path, 'prices.csv')
+    prices.to_csv(path, index=False)
+
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = ServiceClient(f"http://127.0.0.1:{server.server_address[1]}")
+    client.load(path)
+    yield client
+    server.shutdown()
+    server.server_close()
+
+
+def test_predict_serves_linear_and_forest(client):
+    rows = [[60.0, 61.0, 62.0, 63.0, 64.0], [70.0, 70.0, 70.0, 70.0, 70.0]]
+    assert len(client.predict(rows, model='linear')) == 2
+    assert len(client.predict(rows, model='random_forest')) == 2
+
+
+@pytest.mark.parametrize('model', ['baseline', 'lstm', 'nonsense'])
+def test_predict_rejects_models_without_an_estimator(client, model):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        client.predict([[60.0, 61.0, 62.0, 63.0, 64.0]], model=model)
+    assert error.value.code == 400
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+
+class ArtifactStore:
+    """
+    Versioned fitted models on disk, one directory per version:
+
+        <root>/<name>/v0001/model.joblib
+        <root>/<name>/v0001/meta.json
+
+    meta.json records what the model was trained on (lag config, feature columns,
+    data and input fingerprints, metrics) so a restarted app or batch worker can find
+    a matching model instead of refitting. Models are saved uncompressed, which loads
+    fastest. Each load still builds a private copy: sklearn trees copy their node and
+    value arrays into their own buffers when unpickled, so memory-mapping the file would
+    not let processes share a forest.
+    """
+
+    MODEL_FILE = "model.joblib"
+    META_FILE = "meta.json"
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _dir(self, name, version):
+        return os.path.join(self.root, name, f"v{version:04d}")
+
+    def names(self):
+        return sorted(entry for entry in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, entry)))
+
+    def versions(self, name):
+        folder = os.path.join(self.root, name)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(int(entry[1:]) for entry in os.listdir(folder)
+                      if entry.startswith("v") and entry[1:].isdigit()
+                      and os.path.exists(os.path.join(folder, entry, self.META_FILE)))
+
+    def save(self, name, model, **meta):
+        """
+        Stores model as the next version of 'name' and returns that version.
+        Extra keyword arguments (params, feature_cols, data_fingerprint, ...) go into
+        meta.json and must be JSON-serialisable.
+        """
+        # joblib and sklearn are only needed once a model is actually stored or loaded
+        import joblib
+        import sklearn
+        meta = dict(meta, name=name, created=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    estimator=type(model).__name__, sklearn_version=sklearn.__version__)
+
+        # Written to a temporary directory and renamed, so readers never see half a version
+        os.makedirs(os.path.join(self.root, name), exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.join(self.root, name))
+        joblib.dump(model, os.path.join(tmp_dir, self.MODEL_FILE))
+        while True:
+            version = (self.versions(name) or [0])[-1] + 1
+            with open(os.path.join(tmp_dir, self.META_FILE), "w") as f:
+                json.dump(dict(meta, version=version), f, indent=2, default=str)
+            try:
+                os.rename(tmp_dir, self._dir(name, version))
+                return version
+            except OSError:
+                # Another process took this version number first
+                if not os.path.exists(self._dir(name, version)):
+                    raise
+
+    def meta(self, name, version=None):
+        version = version or self.latest(name)
+        if version is None:
+            return None
+        with open(os.path.join(self._dir(name, version), self.META_FILE)) as f:
+            return json.load(f)
+
+    def latest(self, name):
+        versions = self.versions(name)
+        return versions[-1] if versions else None
+
+    def load(self, name, version=None):
+        """
+        Returns (model, meta) for a version of 'name' (the latest by default).
+        """
+        meta = self.meta(name, version)
+        if meta is None:
+            raise KeyError(f"No stored model named '{name}'.")
+        import joblib
+        path = os.path.join(self._dir(name, meta["version"]), self.MODEL_FILE)
+        return joblib.load(path), meta
+
+    def find(self, name, **criteria):
+        """
+        Newest version of 'name' whose meta.json matches every criterion, or None.
+        Values are compared after a JSON round trip, so tuples match stored lists.
+        """
+        wanted = json.loads(json.dumps(criteria, default=str))
+        for version in reversed(self.versions(name)):
+            meta = self.meta(name, version)
+            if all(meta.get(key) == value for key, value in wanted.items()):
+                return version
+        return None
+
+    def delete(self, name, version):
+        shutil.rmtree(self._dir(name, version), ignore_errors=True)
+
+    def prune(self, name, keep=5):
+        """
+        Deletes all but the newest 'keep' versions of 'name'.
+        """
+        for version in self.versions(name)[:-keep]:
+            self.delete(name, version)
@@ -1,30 +1,425 @@
+import hashlib
+import json
+import math
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
 import pandas as pd
 
+from config import INGEST_CACHE_DIR
+from utils.tracing import traced
+
+DATE_COLUMNS = ['date', 'timestamp', 'observation_date']
+PRICE_COLUMNS = ['close', 'price', 'adj close', 'closing price']
+
+# Formats seen in our sources, tried in order before falling back to inference:
+# 2022-01-15 (FRED, Yahoo), 20-May-87 / Nov 10, 2022 (Brent), 1983-03-01 00:00:00+00:00 (WTI)
+DATE_FORMATS = ['%Y-%m-%d', '%d-%b-%y', '%b %d, %Y', '%Y-%m-%d %H:%M:%S%z', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y', '%d/%m/%Y']
+
+SIDECAR_VERSION = 1
+
+# Compact loads read files above this size in chunks
+LARGE_FILE_BYTES = 200 * 1024 * 1024
+DEFAULT_CHUNKSIZE = 250_000
+
+# Columns the dashboard and models read; compact mode drops everything else
+USED_COLUMNS = DATE_COLUMNS + PRICE_COLUMNS + ['volume', 'symbol', 'currency']
+
+# Text columns stored as categories in compact mode (others only when few values repeat)
+CATEGORY_COLUMNS = ['symbol', 'currency']
+
+
 def load_brent_data():
     return pd.read_csv('data/processed/brent_cleaned.csv', parse_dates=['Date'])
 
-def load_csv(file_path):
+
+def detect_schema(file_path, sample_rows=500):
+    """
+    Reads the header and a sample of rows to find the date column and its format.
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    date_cols = [col for col in sample.columns if col.lower() in DATE_COLUMNS]
+    schema = {'date_col': date_cols[0] if date_cols else None, 'date_format': None}
+
+    if schema['date_col']:
+        values = sample[schema['date_col']].dropna().astype(str)
+        for fmt in DATE_FORMATS:
+            try:
+                pd.to_datetime(values, format=fmt)
+            except (ValueError, TypeError):
+                continue
+            schema['date_format'] = fmt
+            break
+
+    return schema
+
+
+def parse_dates(values, date_format=None):
+    """
+    Parses with the detected format first, then tries the other known formats on
+    whatever it left unparsed (Brent switches from 20-May-87 to Nov 10, 2022), and
+    finally falls back to per-element inference. Chunks of a file therefore parse
+    the same way as the whole file.
+    """
+    formats = [date_format] + [fmt for fmt in DATE_FORMATS if fmt != date_format] if date_format else DATE_FORMATS
+    parsed = pd.to_datetime(values, format=formats[0], errors='coerce')
+
+    for fmt in formats[1:] + ['mixed']:
+        missing = parsed.isna() & values.notna()
+        if not missing.any():
+            break
+        candidate = pd.to_datetime(values[missing], format=fmt, errors='coerce')
+        if not missing.all() and candidate.dtype != parsed.dtype:
+            continue
+        parsed = candidate.reindex(values.index) if missing.all() else parsed.fillna(candidate)
+
+    return parsed
+
+
+def _sidecar_dir(file_path, cache_dir):
+    key = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(file_path)}.{key}")
+
+
+def _source_stat(file_path):
+    stat = os.stat(file_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def write_sidecar(df, file_path, schema, cache_dir=INGEST_CACHE_DIR):
+    """
+    Stores a cleaned frame as one .npy file per column plus schema.json.
+    Strings are stored as category codes, datetimes as int64 nanoseconds.
+    """
+    target = _sidecar_dir(file_path, cache_dir)
+    tmp = target + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        info = {'name': col, 'file': f"{i}.npy", 'tz': None, 'categories': None}
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            info['kind'] = 'datetime'
+            info['tz'] = str(series.dt.tz)
+            values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy('M8[ns]').view('i8')
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            info['kind'] = 'datetime'
+            values = series.to_numpy('M8[ns]').view('i8')
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            info['kind'] = 'numeric'
+            values = series.to_numpy()
+        else:
+            info['kind'] = 'category'
+            codes, categories = pd.factorize(series.astype(str))
+            info['categories'] = categories.tolist()
+            values = codes
+        np.save(os.path.join(tmp, info['file']), np.ascontiguousarray(values))
+        columns.append(info)
+
+    np.save(os.path.join(tmp, 'index.npy'), df.index.to_numpy())
+
+    meta = dict(schema, version=SIDECAR_VERSION, source=os.path.abspath(file_path),
+                n_rows=len(df), columns=columns, **_source_stat(file_path))
+    with open(os.path.join(tmp, 'schema.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+
+
+def read_sidecar(file_path, cache_dir=INGEST_CACHE_DIR):
+    """
+    Returns the cached frame if a valid sidecar exists for the current file, else None.
+    Numeric columns are memory-mapped copy-on-write, so they load without a full read.
+    """
+    target = _sidecar_dir(file_path, cache_dir)
+    try:
+        with open(os.path.join(target, 'schema.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # Any change to the source invalidates the sidecar
+    if meta.get('version') != SIDECAR_VERSION or _source_stat(file_path) != {
+            'mtime_ns': meta['mtime_ns'], 'size': meta['size']}:
+        return None
+
+    try:
+        data = {}
+        for info in meta['columns']:
+            values = np.asarray(np.load(os.path.join(target, info['file']), mmap_mode='c'))
+            if len(values) != meta['n_rows']:
+                return None
+            if info['kind'] == 'datetime':
+                values = pd.Series(values.view('M8[ns]'))
+                if info['tz']:
+                    values = values.dt.tz_localize('UTC').dt.tz_convert(info['tz'])
+                values = values.to_numpy() if not info['tz'] else values.array
+            elif info['kind'] == 'category':
+                values = pd.Categorical.from_codes(values, info['categories']).astype(object)
+            data[info['name']] = values
+
+        index = np.load(os.path.join(target, 'index.npy'))
+        if len(index) != meta['n_rows']:
+            return None
+        return pd.DataFrame(data, index=index, copy=False)
+    except Exception as e:
+        print(f"[Error reading ingest cache] {e}")
+        return None
+
+
+def _is_monotonic(file_path, date_col, date_format, chunksize):
+    """
+    Cheap first pass over the date column only: is the file already in date order?
+    Returns (sorted, n_rows).
+    """
+    previous, n_rows, ordered = None, 0, True
+    for chunk in pd.read_csv(file_path, usecols=[date_col], chunksize=chunksize):
+        dates = parse_dates(chunk[date_col], date_format).dropna()
+        n_rows += len(chunk)
+        if len(dates) == 0:
+            continue
+        if not dates.is_monotonic_increasing or (previous is not None and dates.iloc[0] < previous):
+            ordered = False
+        previous = dates.iloc[-1]
+    return ordered, n_rows
+
+
+def _spill(frame, spill_dir, name):
+    path = os.path.join(spill_dir, name)
+    with open(path, 'wb') as f:
+        pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _unspill(path):
+    with open(path, 'rb') as f:
+        frame = pickle.load(f)
+    os.remove(path)
+    return frame
+
+
+def _merge_runs(runs, date_col):
+    """
+    k-way merge of sorted runs, each a list of spilled blocks.
+    Emits every buffered row up to the smallest block maximum, which is safe because
+    no later block of any run can hold an earlier date.
+    """
+    runs = [list(blocks) for blocks in runs if blocks]
+    buffers = [_unspill(blocks.pop(0)) for blocks in runs]
+
+    while any(len(buf) for buf in buffers):
+        bound = min(buf[date_col].iloc[-1] for buf in buffers if len(buf))
+        parts = []
+        for r, buf in enumerate(buffers):
+            if not len(buf):
+                continue
+            take = buf[date_col] <= bound
+            parts.append(buf[take])
+            buffers[r] = buf[~take]
+            if not len(buffers[r]) and runs[r]:
+                buffers[r] = _unspill(runs[r].pop(0))
+        yield pd.concat(parts).sort_values(by=date_col, kind='mergesort')
+
+
+def _ordered_chunks(file_path, schema, chunksize, spill_dir):
+    """
+    Raw chunks in date order with parsed dates; rows without a date come last,
+    as they do after sort_values.
+    """
+    date_col, date_format = schema['date_col'], schema['date_format']
+    if not date_col:
+        yield from pd.read_csv(file_path, chunksize=chunksize)
+        return
+
+    ordered, n_rows = _is_monotonic(file_path, date_col, date_format, chunksize)
+    undated = []
+    runs = []
+    # Keep the merge buffers (one block per run) around one chunk in total
+    block = max(1000, chunksize // max(1, math.ceil(n_rows / chunksize)))
+
+    for i, chunk in enumerate(pd.read_csv(file_path, chunksize=chunksize)):
+        chunk[date_col] = parse_dates(chunk[date_col], date_format)
+        missing = chunk[date_col].isna()
+        if missing.any():
+            undated.append(_spill(chunk[missing], spill_dir, f"undated_{i}.pkl"))
+            chunk = chunk[~missing]
+
+        if ordered:
+            yield chunk
+        else:
+            chunk = chunk.sort_values(by=date_col, kind='mergesort')
+            runs.append([_spill(chunk.iloc[j:j + block], spill_dir, f"run_{i}_{j}.pkl")
+                         for j in range(0, len(chunk), block)])
+
+    if not ordered:
+        yield from _merge_runs(runs, date_col)
+
+    for path in undated:
+        yield _unspill(path)
+
+
+def iter_csv_chunks(file_path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Streams the same cleaned rows as load_csv, in date order, one chunk at a time.
+    Memory stays bounded by the chunk size: unsorted files are sorted through
+    spilled runs on disk, and forward-fill state is carried across chunk boundaries.
+    """
+    schema = detect_schema(file_path)
+    last_values = None
+
+    with tempfile.TemporaryDirectory(prefix='oil_chunks_') as spill_dir:
+        for chunk in _ordered_chunks(file_path, schema, chunksize, spill_dir):
+            chunk = chunk.dropna(how='all')
+            if chunk.empty:
+                continue
+
+            # Leading gaps are filled from the last row of the previous chunk
+            chunk = chunk.ffill()
+            if last_values is not None:
+                chunk = chunk.fillna(last_values)
+            last_values = chunk.iloc[-1]
+
+            chunk = chunk.dropna()
+            if not chunk.empty:
+                yield chunk
+
+
+def find_price_col(df):
+    """
+    Returns the first column that looks like a price ('Close', 'Price', ...), or None.
+    """
+    for col in df.columns:
+        if col.lower() in PRICE_COLUMNS:
+            return col
+    return None
+
+
+class PriceSummary:
+    """
+    Streaming reducer for the dashboard's price cards (average, high, low).
+    """
+
+    def __init__(self, price_col=None):
+        self.price_col = price_col
+        self.count = 0
+        self.total = 0.0
+        self.high = None
+        self.low = None
+
+    def update(self, chunk):
+        if self.price_col is None:
+            self.price_col = find_price_col(chunk)
+        if self.price_col is None or chunk.empty:
+            return self
+        prices = chunk[self.price_col]
+        self.count += len(prices)
+        self.total += float(prices.sum())
+        self.high = float(prices.max()) if self.high is None else max(self.high, float(prices.max()))
+        self.low = float(prices.min()) if self.low is None else min(self.low, float(prices.min()))
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+def reduce_csv(file_path, reducer, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Feeds each cleaned chunk to reducer.update() without holding the whole file.
+    """
+    for chunk in iter_csv_chunks(file_path, chunksize):
+        reducer.update(chunk)
+    return reducer
+
+
+def frame_memory_mb(df):
+    """
+    Deep memory use of a DataFrame (including string contents) in MB.
+    """
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def compact_frame(df, keep=USED_COLUMNS):
+    """
+    Smaller copy of df: columns whose lower-cased name is not in 'keep' are dropped,
+    floats become float32 (prices keep about 7 significant digits, far below quote
+    precision), integers take the smallest type that holds them and repeated text
+    becomes categorical. The models still build float64 features from it.
+    """
+    if keep is not None:
+        df = df[[col for col in df.columns if col.lower() in keep]]
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_float_dtype(values):
+            columns[col] = values.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(values):
+            columns[col] = pd.to_numeric(values, downcast='integer')
+        elif values.dtype == object and (col.lower() in CATEGORY_COLUMNS or values.nunique() < len(values) // 2):
+            columns[col] = values.astype('category')
+        else:
+            columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+@traced()
+def load_csv(file_path, use_cache=True, cache_dir=INGEST_CACHE_DIR, chunksize=None, compact=False):
     """
     Loads and preprocesses a CSV file for oil & gas price prediction.
     Ensures date parsing, sorting, and handles missing values.
+    Cleaned results are cached under INGEST_CACHE_DIR and reused until the file changes.
+    With chunksize the file is read through iter_csv_chunks instead of in one go. That
+    alone does not bound memory: every chunk is held until the concat, next to the
+    joined copy. Only reduce_csv streams in bounded memory.
+    With compact=True the frame is passed through compact_frame; chunked reads compact
+    every chunk as it arrives, so the full-size frame never exists in memory.
     """
     try:
+        if use_cache:
+            cached = read_sidecar(file_path, cache_dir)
+            if cached is not None:
+                return compact_frame(cached) if compact else cached
+
+        schema = detect_schema(file_path)
+
+        if chunksize:
+            if compact:
+                # Categories differ between chunks, so they are rebuilt once after the concat.
+                # No sidecar is written: it has to hold the full frame.
+                return compact_frame(pd.concat(compact_frame(chunk) for chunk in iter_csv_chunks(file_path, chunksize)))
+            df = pd.concat(iter_csv_chunks(file_path, chunksize))
+            if use_cache:
+                write_sidecar(df, file_path, schema, cache_dir)
+            return df
+
         df = pd.read_csv(file_path)
 
         # Convert date column if present
-        date_cols = [col for col in df.columns if col.lower() in ['date', 'timestamp']]
-        if date_cols:
-            df[date_cols[0]] = pd.to_datetime(df[date_cols[0]], errors='coerce')
-            df = df.sort_values(by=date_cols[0])
+        date_col = schema['date_col']
+        if date_col:
+            df[date_col] = parse_dates(df[date_col], schema['date_format'])
+            df = df.sort_values(by=date_col)
 
         # Drop rows with all NaNs
         df.dropna(how='all', inplace=True)
 
         # Fill or drop missing values as needed
-        df.fillna(method='ffill', inplace=True)
+        df.ffill(inplace=True)
         df.dropna(inplace=True)
 
-        return df
+        if use_cache:
+            try:
+                write_sidecar(df, file_path, schema, cache_dir)
+            except Exception as e:
+                print(f"[Error writing ingest cache] {e}")
+
+        return compact_frame(df) if compact else df
 
     except Exception as e:
         print(f"[Error loading CSV] {e}")
@@ -0,0 +1,164 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.data_loader import PRICE_COLUMNS, find_price_col  # noqa: F401
+from utils.macro_registry import asof_align, make_series
+from utils.tracing import traced
+
+# Lag matrix shared by every model: X holds lag_1..lag_n (+ Inflation, + registered macros), y the price,
+# index the original row labels of each sample.
+FeatureMatrix = namedtuple('FeatureMatrix', ['X', 'y', 'index', 'feature_cols', 'price_col'])
+
+_FEATURE_CACHE = OrderedDict()
+_FEATURE_CACHE_SIZE = 8
+_FEATURE_CACHE_LOCK = threading.Lock()
+
+
+def window_view(values, window):
+    """
+    Read-only (n - window + 1, window) view of consecutive windows; no data is copied.
+    """
+    return sliding_window_view(np.asarray(values), window)
+
+
+def lag_view(values, n_lags):
+    """
+    Zero-copy lag matrix: row t holds [lag_1, ..., lag_n] for sample t + n_lags.
+    """
+    return window_view(values, n_lags + 1)[:, :n_lags][:, ::-1]
+
+
+def lead_view(values, n_leads):
+    """
+    Zero-copy lead matrix: row t holds [lead_1, ..., lead_n] for sample t.
+    """
+    return window_view(values, n_leads + 1)[:, 1:]
+
+
+def rolling_mean(values, window):
+    """
+    Trailing mean over 'window' rows computed from a cumulative sum.
+    The first window - 1 entries are NaN, like Series.rolling(window).mean().
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        csum = np.cumsum(np.concatenate(([0.0], values)))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def fingerprint(obj):
+    """
+    Content hash of a DataFrame, Series or array, used as a cache key.
+    """
+    if obj is None:
+        return None
+    h = hashlib.sha1()
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr(list(obj.columns)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    else:
+        h.update(np.ascontiguousarray(obj).tobytes())
+    return h.hexdigest()
+
+
+@traced()
+def align_inflation(df, inflation_df):
+    """
+    Latest inflation reading at or before every row of df (as-of on 'Date').
+    Rows before the first reading take its value.
+    """
+    series = make_series('Inflation', inflation_df['Date'], inflation_df['Inflation'])
+    return asof_align(df['Date'].to_numpy(), series, backfill=True)
+
+
+@traced()
+def build_lag_features(df, inflation_df=None, n_lags=5, macros=None):
+    """
+    Builds (or fetches from cache) the lag feature matrix for df.
+    Without inflation X is a strided view over the price column, so no lag is copied.
+    'macros' is an optional MacroRegistry whose series are appended as columns,
+    using the registry's shared as-of alignment.
+    """
+    price_col = find_price_col(df)
+    if not price_col:
+        raise ValueError("Dataset must contain a column named 'Close', 'Price', or similar.")
+
+    if len(df) <= n_lags:
+        raise ValueError(f"Dataset needs more than {n_lags} rows to build {n_lags} lags.")
+
+    use_inflation = inflation_df is not None and 'Date' in df.columns
+    use_macros = macros is not None and len(macros) > 0 and 'Date' in df.columns
+    key_cols = [price_col, 'Date'] if 'Date' in df.columns else [price_col]
+    key = (fingerprint(df[key_cols]), fingerprint(inflation_df) if use_inflation else None,
+           macros.fingerprint() if use_macros else None, n_lags)
+
+    with _FEATURE_CACHE_LOCK:
+        if key in _FEATURE_CACHE:
+            _FEATURE_CACHE.move_to_end(key)
+            return _FEATURE_CACHE[key]
+
+    prices = df[price_col].to_numpy(dtype=float)
+    X = lag_view(prices, n_lags)
+    y = prices[n_lags:]
+    index = df.index[n_lags:]
+    feature_cols = [f'lag_{i}' for i in range(1, n_lags + 1)]
+
+    # Rows with a missing price anywhere in their window are dropped
+    valid = ~window_view(np.isnan(prices), n_lags + 1).any(axis=1)
+
+    exog = []
+    if use_inflation:
+        exog.append(('Inflation', align_inflation(df, inflation_df)[n_lags:]))
+    if use_macros:
+        aligned = macros.align(df['Date'].to_numpy())
+        exog.extend((name, aligned[name].to_numpy()[n_lags:]) for name in aligned.columns)
+    if exog:
+        for name, values in exog:
+            valid &= ~np.isnan(values)
+            feature_cols.append(name)
+        X = np.column_stack([X] + [values for _, values in exog])
+
+    if not valid.all():
+        X, y, index = X[valid], y[valid], index[valid]
+
+    y.flags.writeable = False
+    if X.flags.writeable:
+        X.flags.writeable = False
+
+    features = FeatureMatrix(X, y, index, feature_cols, price_col)
+    with _FEATURE_CACHE_LOCK:
+        _FEATURE_CACHE[key] = features
+        if len(_FEATURE_CACHE) > _FEATURE_CACHE_SIZE:
+            _FEATURE_CACHE.popitem(last=False)
+
+    return features
+
+
+def feature_cache_mb():
+    """
+    Memory held by the cached feature matrices in MB. Lag views are counted through
+    the array they view, once however many matrices share it.
+    """
+    with _FEATURE_CACHE_LOCK:
+        entries = list(_FEATURE_CACHE.values())
+    roots = {}
+    for features in entries:
+        for array in (features.X, features.y):
+            while isinstance(array.base, np.ndarray):
+                array = array.base
+            roots[id(array)] = array.nbytes
+    return sum(roots.values()) / 1024 / 1024
+
+
+def clear_feature_cache():
+    with _FEATURE_CACHE_LOCK:
+        _FEATURE_CACHE.clear()
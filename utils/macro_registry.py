@@ -0,0 +1,198 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import DATE_COLUMNS, parse_dates
+from utils.tracing import traced
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+EIA_CRUDE_STOCKS = 'Weekly U.S. Ending Stocks of Crude Oil  (Thousand Barrels)'
+
+# One macro time series: ascending datetime64[ns] dates with their float values
+MacroSeries = namedtuple('MacroSeries', ['name', 'dates', 'values'])
+
+
+def make_series(name, dates, values):
+    """
+    Sorted series with missing observations removed; of repeated dates the last one wins.
+    """
+    dates = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+    values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+    keep = ~(np.isnat(dates) | np.isnan(values))
+    dates, values = dates[keep], values[keep]
+
+    order = np.argsort(dates, kind='stable')
+    dates, values = dates[order], values[order]
+    last = np.append(dates[1:] != dates[:-1], True)
+    return MacroSeries(name, dates[last], values[last])
+
+
+def asof_align(dates, series, backfill=False):
+    """
+    Value of the latest observation at or before each date (one searchsorted pass).
+    Dates before the first observation get NaN, or the first value with backfill=True.
+    """
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    if not len(series.values):
+        return np.full(len(dates), np.nan)
+    idx = np.searchsorted(series.dates, dates, side='right') - 1
+    if backfill:
+        return series.values[np.clip(idx, 0, None)]
+    return np.where(idx >= 0, series.values[np.clip(idx, 0, None)], np.nan)
+
+
+def inflation_to_long(df):
+    """
+    Date/Inflation frame from either the wide layout (Year, Jan..Dec) or a long one
+    (a date column and a value column).
+    """
+    if 'Year' in df.columns and any(month in df.columns for month in MONTHS):
+        melted = df.melt(id_vars='Year', var_name='Month', value_name='Inflation')
+        melted = melted[melted['Month'].isin(MONTHS)]
+        month_numbers = melted['Month'].map({month: i + 1 for i, month in enumerate(MONTHS)})
+        dates = pd.to_datetime(pd.DataFrame({'year': melted['Year'], 'month': month_numbers, 'day': 1}))
+        long_df = pd.DataFrame({'Date': dates.to_numpy(), 'Inflation': melted['Inflation'].to_numpy()})
+    else:
+        date_col = next((col for col in df.columns if col.lower() in DATE_COLUMNS), df.columns[0])
+        value_col = 'Inflation' if 'Inflation' in df.columns else [col for col in df.columns if col != date_col][0]
+        long_df = pd.DataFrame({'Date': parse_dates(df[date_col].astype(str)).to_numpy(),
+                                'Inflation': pd.to_numeric(df[value_col], errors='coerce').to_numpy()})
+    return long_df.sort_values('Date', kind='stable').reset_index(drop=True)
+
+
+def read_inflation(path):
+    return inflation_to_long(pd.read_csv(path))
+
+
+def read_fred(path, name=None):
+    """
+    Two-column FRED export (observation_date, SERIES_ID); named after the series by default.
+    """
+    df = pd.read_csv(path)
+    return make_series(name or df.columns[1], parse_dates(df.iloc[:, 0].astype(str)), df.iloc[:, 1])
+
+
+def read_eia(path, column=EIA_CRUDE_STOCKS, name='Crude_Stocks'):
+    """
+    One column of an EIA weekly stocks workbook export (two banner rows above the header).
+    """
+    df = pd.read_csv(path, skiprows=2, usecols=['Date', column])
+    values = df[column].astype(str).str.strip()
+    return make_series(name, parse_dates(df['Date'], '%b %d, %Y'), values)
+
+
+def read_series(path, name=None):
+    """
+    Any supported macro file: EIA export, wide or long inflation table, or FRED series.
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        first_line = f.readline()
+    if first_line.startswith('Back to Contents'):
+        return read_eia(path, name=name or 'Crude_Stocks')
+
+    df = pd.read_csv(path)
+    if 'Year' in df.columns or 'Inflation' in df.columns:
+        long_df = inflation_to_long(df)
+        # 'Inflation' itself is the feature built from the controller's inflation table
+        return make_series(name or 'Macro_Inflation', long_df['Date'], long_df['Inflation'])
+    date_col = next((col for col in df.columns if col.lower() in DATE_COLUMNS), df.columns[0])
+    value_col = [col for col in df.columns if col != date_col][0]
+    return make_series(name or value_col, parse_dates(df[date_col].astype(str)), df[value_col])
+
+
+def _hash_dates(dates):
+    return hashlib.sha1(np.ascontiguousarray(np.asarray(dates, dtype='datetime64[ns]')).tobytes()).hexdigest()
+
+
+class MacroRegistry:
+    """
+    Named macro series that become extra model features.
+
+    align() maps every price date to the latest observation of every series with one
+    searchsorted per series and caches the result per set of dates, so all models and
+    runs on a dataset share one alignment however many series are registered.
+    Rows before a series' first observation take its first value, as the inflation
+    feature always has.
+    """
+
+    def __init__(self, max_alignments=8):
+        self.series = OrderedDict()
+        self.max_alignments = max_alignments
+        self.alignments = OrderedDict()
+        self.lock = threading.Lock()
+        self._fingerprint = None
+
+    def __len__(self):
+        return len(self.series)
+
+    def names(self):
+        return list(self.series)
+
+    def register(self, series):
+        if series.name == 'Inflation':
+            raise ValueError("'Inflation' is the inflation table's feature; register the series under another name.")
+        with self.lock:
+            self.series[series.name] = series
+            self.alignments.clear()
+            self._fingerprint = None
+        return series
+
+    def add(self, name, dates, values):
+        return self.register(make_series(name, dates, values))
+
+    def load(self, path, name=None):
+        return self.register(read_series(path, name))
+
+    def remove(self, name):
+        with self.lock:
+            self.series.pop(name, None)
+            self.alignments.clear()
+            self._fingerprint = None
+
+    def fingerprint(self):
+        """
+        Content hash of every registered series, for cache keys; None when empty.
+        """
+        with self.lock:
+            if not self.series:
+                return None
+            if self._fingerprint is None:
+                h = hashlib.sha1()
+                for series in self.series.values():
+                    h.update(series.name.encode())
+                    h.update(series.dates.tobytes())
+                    h.update(series.values.tobytes())
+                self._fingerprint = h.hexdigest()
+            return self._fingerprint
+
+    @traced()
+    def align(self, dates):
+        """
+        DataFrame with one column per registered series, aligned to 'dates'.
+        """
+        key = _hash_dates(dates)
+        with self.lock:
+            if key in self.alignments:
+                self.alignments.move_to_end(key)
+                return self.alignments[key]
+            series = list(self.series.values())
+
+        aligned = pd.DataFrame({s.name: asof_align(dates, s, backfill=True) for s in series},
+                               columns=[s.name for s in series])
+        with self.lock:
+            self.alignments[key] = aligned
+            if len(self.alignments) > self.max_alignments:
+                self.alignments.popitem(last=False)
+        return aligned
+
+    def __getstate__(self):
+        # Locks do not pickle; process-pool workers get the series and rebuild the rest
+        return {'series': self.series, 'max_alignments': self.max_alignments}
+
+    def __setstate__(self, state):
+        self.__init__(state['max_alignments'])
+        self.series = state['series']
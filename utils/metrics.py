@@ -1,10 +1,126 @@
 # utils/metrics.py
 
-from sklearn.metrics import mean_squared_error, mean_absolute_error
 import numpy as np
 
+METRIC_NAMES = ('rmse', 'mae', 'mape', 'directional_accuracy', 'accuracy')
+
+
+def _as_pair(y_true, y_pred):
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    if y_true.shape != y_pred.shape:
+        raise ValueError(f"y_true and y_pred have different shapes: {y_true.shape} vs {y_pred.shape}.")
+    if y_true.size == 0:
+        raise ValueError("Cannot score empty predictions.")
+    return y_true, y_pred
+
+
 def calculate_rmse(y_true, y_pred):
-    return np.sqrt(mean_squared_error(y_true, y_pred))
+    y_true, y_pred = _as_pair(y_true, y_pred)
+    return np.sqrt(np.mean((y_pred - y_true) ** 2))
+
 
 def calculate_mae(y_true, y_pred):
-    return mean_absolute_error(y_true, y_pred)
+    y_true, y_pred = _as_pair(y_true, y_pred)
+    return np.mean(np.abs(y_pred - y_true))
+
+
+def calculate_accuracy(y_true, y_pred):
+    """
+    The dashboard's accuracy figure: 100 - MAE as a percentage of the mean actual price.
+    """
+    y_true, y_pred = _as_pair(y_true, y_pred)
+    return 100.0 - np.mean(np.abs(y_pred - y_true)) / np.mean(y_true) * 100
+
+
+def _finish(sum_sq, sum_abs, sum_true, count, sum_ape, count_ape, hits, count_dir):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mae = sum_abs / count
+        return {
+            'rmse': np.sqrt(sum_sq / count),
+            'mae': mae,
+            'mape': sum_ape / count_ape * 100,
+            'directional_accuracy': hits / count_dir * 100,
+            'accuracy': 100.0 - mae / (sum_true / count) * 100,
+            'count': count,
+        }
+
+
+def _sums(y_true, y_pred, y_prev):
+    """
+    Per-series sums over the last axis; NaN in either input marks a missing observation.
+    """
+    valid = ~(np.isnan(y_true) | np.isnan(y_pred))
+    error = np.where(valid, y_pred - y_true, 0.0)
+    actual = np.where(valid, y_true, 0.0)
+    abs_error = np.abs(error)
+
+    # Percentage errors skip zero actuals
+    with_pct = valid & (actual != 0)
+    ape = np.divide(abs_error, np.abs(actual), out=np.zeros_like(abs_error), where=with_pct)
+
+    # Direction is judged against the previous actual price
+    moved = valid & ~np.isnan(y_prev)
+    hit = moved & (np.sign(y_pred - y_prev) == np.sign(y_true - y_prev))
+
+    return (
+        (error ** 2).sum(axis=-1), abs_error.sum(axis=-1), actual.sum(axis=-1), valid.sum(axis=-1),
+        ape.sum(axis=-1), with_pct.sum(axis=-1), hit.sum(axis=-1), moved.sum(axis=-1),
+    )
+
+
+def batch_metrics(y_true, y_pred, y_prev=None):
+    """
+    RMSE, MAE, MAPE, directional accuracy and accuracy for many prediction series at once.
+
+    y_pred can be stacked to any shape whose last axis holds the observations, e.g.
+    (models, folds, horizons, n); y_true (and y_prev) must broadcast against it, so one
+    set of actuals can be shared by every model. Ragged series are padded with NaN.
+    y_prev is the last known price before each target; by default it is the preceding
+    actual along the last axis (the first observation then has no direction).
+
+    Returns a dict of arrays shaped like y_pred without its last axis, plus 'count'.
+    """
+    y_pred = np.asarray(y_pred, dtype=float)
+    y_true = np.broadcast_to(np.asarray(y_true, dtype=float), y_pred.shape)
+    if y_prev is None:
+        y_prev = np.concatenate([np.full(y_true.shape[:-1] + (1,), np.nan), y_true[..., :-1]], axis=-1)
+    else:
+        y_prev = np.broadcast_to(np.asarray(y_prev, dtype=float), y_pred.shape)
+
+    return _finish(*_sums(y_true, y_pred, y_prev))
+
+
+class MetricAccumulator:
+    """
+    Running version of batch_metrics for actuals that arrive over time.
+    update() takes the same (..., n) arrays; the leading shape must stay the same
+    between calls. The last actual of each update is remembered so that direction
+    is scored across update boundaries.
+    """
+
+    def __init__(self):
+        self.sums = None
+        self.last_actual = None
+
+    def update(self, y_true, y_pred, y_prev=None):
+        y_pred = np.asarray(y_pred, dtype=float)
+        if y_pred.ndim == 0:
+            y_pred = y_pred[None]
+        y_true = np.broadcast_to(np.asarray(y_true, dtype=float), y_pred.shape)
+
+        if y_prev is None:
+            first = self.last_actual if self.last_actual is not None else np.full(y_true.shape[:-1], np.nan)
+            y_prev = np.concatenate([np.broadcast_to(first, y_true.shape[:-1])[..., None], y_true[..., :-1]], axis=-1)
+        else:
+            y_prev = np.broadcast_to(np.asarray(y_prev, dtype=float), y_pred.shape)
+
+        sums = _sums(y_true, y_pred, y_prev)
+        self.sums = sums if self.sums is None else tuple(total + part for total, part in zip(self.sums, sums))
+        self.last_actual = y_true[..., -1].copy()
+        return self
+
+    def result(self):
+        if self.sums is None:
+            raise ValueError("No observations have been added yet.")
+        return _finish(*self.sums)
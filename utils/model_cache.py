@@ -0,0 +1,114 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+class ModelCache:
+    """
+    Cache of fitted models and their results, keyed by a content hash of the data,
+    the inflation frame, the model type and its hyperparameters.
+
+    Entries live in an in-memory LRU; when disk_dir is set they are also pickled there
+    and the oldest files are evicted once the directory exceeds max_disk_bytes.
+    """
+
+    def __init__(self, max_entries=16, disk_dir=None, max_disk_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data_fingerprint, inflation_fingerprint, model_type, params=None):
+        h = hashlib.sha256()
+        h.update(str(data_fingerprint).encode())
+        h.update(str(inflation_fingerprint).encode())
+        h.update(model_type.encode())
+        h.update(repr(sorted((params or {}).items())).encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def get_or_compute(self, key, compute):
+        entry = self.get(key)
+        if entry is None:
+            entry = compute()
+            self.put(key, entry)
+        return entry
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def _remember(self, key, entry):
+        with self.lock:
+            self.memory[key] = entry
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _read_disk(self, key):
+        if not self.disk_dir or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                entry = pickle.load(f)
+            # Touch the file so eviction treats it as recently used
+            os.utime(self._path(key))
+            return entry
+        except Exception as e:
+            print(f"[Error reading model cache] {e}")
+            return None
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        try:
+            tmp_path = self._path(key) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except Exception as e:
+            print(f"[Error writing model cache] {e}")
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith('.pkl'):
+                stat = os.stat(os.path.join(self.disk_dir, name))
+                files.append((stat.st_mtime, stat.st_size, name))
+
+        # Drop least recently used files until the tier fits its budget
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.disk_dir, name))
+            total -= size
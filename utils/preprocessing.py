@@ -1,14 +1,37 @@
 import pandas as pd
 import yfinance as yf
 import os
-
-# === Brent Preprocessing ===
-def preprocess_brent_data(path='/Users/salma.abbady/Documents/GitHub/Oil-Price-Predictor/data/raw/brent_crude.csv'):
-    df = pd.read_csv(path)
-
+import json
+from config import RAW_DATA_DIR, PROCESSED_DATA_DIR
+from utils.features import lag_view, rolling_mean
+from utils.data_loader import parse_dates
+from utils.macro_registry import asof_align, read_eia, read_fred
+
+
+def add_lag_features(df, n_lags=30, windows=(7, 30)):
+    """
+    Adds lag_1..lag_n and rolling means of 'Price' in one allocation and drops
+    the warm-up rows, instead of one shifted copy per lag.
+    """
+    prices = df['Price'].to_numpy(dtype=float)
+    start = max(n_lags, max(windows) - 1)
+
+    lags = lag_view(prices, n_lags)[start - n_lags:]
+    columns = {f'lag_{i}': lags[:, i - 1] for i in range(1, n_lags + 1)}
+    for window in windows:
+        columns[f'rolling_{window}'] = rolling_mean(prices, window)[start:]
+
+    features = pd.DataFrame(columns, index=df.index[start:])
+    return pd.concat([df.iloc[start:], features], axis=1).dropna()
+
+
+def clean_brent(df):
+    """
+    Parses, sorts and forward-fills raw Brent prices, then adds lag/rolling features.
+    """
     try:
         df['Date'] = df['Date'].astype(str).str.strip('"')
-        df['Date'] = pd.to_datetime(df['Date'], format='mixed')
+        df['Date'] = parse_dates(df['Date'], '%d-%b-%y')
     except Exception as e:
         print("Date parsing failed:", e)
         print("Sample of 'Date' column:", df['Date'].unique()[:5])
@@ -18,12 +41,12 @@ def preprocess_brent_data(path='/Users/salma.abbady/Documents/GitHub/Oil-Price-P
     df.reset_index(drop=True, inplace=True)
     df['Price'] = df['Price'].ffill()
 
-    for i in range(1, 31):
-        df[f'lag_{i}'] = df['Price'].shift(i)
+    return add_lag_features(df)
 
-    df['rolling_7'] = df['Price'].rolling(window=7).mean()
-    df['rolling_30'] = df['Price'].rolling(window=30).mean()
-    df.dropna(inplace=True)
+
+# === Brent Preprocessing ===
+def preprocess_brent_data(path='/Users/salma.abbady/Documents/GitHub/Oil-Price-Predictor/data/raw/brent_crude.csv'):
+    df = clean_brent(pd.read_csv(path))
 
     output_dir = '/Users/salma.abbady/Documents/GitHub/Oil-Price-Predictor/data/processed'
     os.makedirs(output_dir, exist_ok=True)
@@ -46,12 +69,7 @@ def preprocess_wti_data(path='/Users/salma.abbady/Documents/GitHub/Oil-Price-Pre
     df.reset_index(drop=True, inplace=True)
     df['Price'] = df['Price'].ffill()
 
-    for i in range(1, 31):
-        df[f'lag_{i}'] = df['Price'].shift(i)
-
-    df['rolling_7'] = df['Price'].rolling(window=7).mean()
-    df['rolling_30'] = df['Price'].rolling(window=30).mean()
-    df.dropna(inplace=True)
+    df = add_lag_features(df)
 
     output_dir = '/Users/salma.abbady/Documents/GitHub/Oil-Price-Predictor/data/processed'
     os.makedirs(output_dir, exist_ok=True)
@@ -141,3 +159,95 @@ def merge_eia_data(
 
     print(f"Final dataset with EIA data saved to: {output_path}")
     return merged
+
+
+# === In-memory macro pipeline ===
+class MacroPipeline:
+    """
+    Builds brent_with_all_macros without the intermediate CSVs of the
+    merge_cpi_with_brent -> merge_interest_rate -> merge_eia_data chain.
+
+    Each source is read once, every macro series is aligned to the Brent dates in a
+    single as-of pass, and re-runs only append rows newer than the last output.
+    Rows dated after the latest observation of some macro series are provisional
+    (a later release can still change their values) and are rewritten on the next run.
+    """
+
+    def __init__(self,
+                 brent_path=os.path.join(RAW_DATA_DIR, 'brent_crude.csv'),
+                 cpi_path=os.path.join(RAW_DATA_DIR, 'cpi_usa.csv'),
+                 fedfunds_path=os.path.join(RAW_DATA_DIR, 'fedfunds.csv'),
+                 eia_path=os.path.join(RAW_DATA_DIR, 'eia_data.csv'),
+                 output_path=os.path.join(PROCESSED_DATA_DIR, 'brent_with_all_macros.csv'),
+                 start_date='2000-01-01'):
+        self.brent_path = brent_path
+        self.cpi_path = cpi_path
+        self.fedfunds_path = fedfunds_path
+        self.eia_path = eia_path
+        self.output_path = output_path
+        self.state_path = output_path + '.state.json'
+        self.start_date = pd.Timestamp(start_date)
+
+    def load_sources(self):
+        """
+        Reads Brent and every macro source once, with the macro registry's parsers.
+        Macro series are sorted MacroSeries in output column order.
+        """
+        brent = clean_brent(pd.read_csv(self.brent_path))
+        brent = brent[brent['Date'] >= self.start_date].reset_index(drop=True)
+
+        macros = {
+            'CPI_USA': read_fred(self.cpi_path, 'CPI_USA'),
+            'Fed_Funds_Rate': read_fred(self.fedfunds_path, 'Fed_Funds_Rate'),
+            'Crude_Stocks': read_eia(self.eia_path),
+        }
+        return brent, macros
+
+    @staticmethod
+    def align(dates, macros):
+        """
+        Latest observation at or before each date, for every macro series at once.
+        """
+        return pd.DataFrame({name: asof_align(dates, series) for name, series in macros.items()})
+
+    def _read_state(self):
+        if not os.path.exists(self.output_path) or not os.path.exists(self.state_path):
+            return {'offset': 0, 'final_date': None}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def run(self, full=False):
+        """
+        Materializes the merged dataset; returns the number of rows written.
+        """
+        brent, macros = self.load_sources()
+        state = {'offset': 0, 'final_date': None} if full else self._read_state()
+
+        if state['final_date'] is not None:
+            brent = brent[brent['Date'] > pd.Timestamp(state['final_date'])]
+        if brent.empty:
+            return 0
+
+        merged = pd.concat([brent.reset_index(drop=True), self.align(brent['Date'], macros)], axis=1)
+
+        # Rows up to the oldest "latest observation" can no longer change
+        final_until = min(series.dates[-1] for series in macros.values())
+        is_final = merged['Date'].to_numpy() <= final_until
+        final, provisional = merged[is_final], merged[~is_final]
+
+        os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
+        mode = 'r+' if state['offset'] and os.path.exists(self.output_path) else 'w'
+        with open(self.output_path, mode, newline='') as f:
+            f.seek(state['offset'])
+            f.truncate()
+            final.to_csv(f, index=False, header=state['offset'] == 0)
+            offset = f.tell()
+            provisional.to_csv(f, index=False, header=offset == 0)
+
+        if len(final):
+            state = {'offset': offset, 'final_date': str(final['Date'].iloc[-1])}
+        with open(self.state_path, 'w') as f:
+            json.dump(state, f)
+
+        print(f"Wrote {len(merged)} rows ({len(provisional)} provisional) to: {self.output_path}")
+        return len(merged)
@@ -0,0 +1,190 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Spans are only recorded while tracing is switched on; otherwise span() hands back a
+# shared no-op object and traced() calls straight through after one flag check.
+_enabled = False
+_sinks = []
+_events = deque(maxlen=100_000)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class Span:
+    """
+    Times a block of work. Set 'rows' inside the block if the count is only known later.
+    """
+    __slots__ = ("name", "rows", "args", "start", "depth")
+
+    def __init__(self, name, rows=None, args=None):
+        self.name = name
+        self.rows = rows
+        self.args = args or {}
+
+    def __enter__(self):
+        self.depth = getattr(_local, "depth", 0)
+        _local.depth = self.depth + 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        _local.depth = self.depth
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _record(self, end)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable(sink=None):
+    """
+    Starts recording spans. 'sink' is called with every finished event, on the thread
+    that finished it.
+    """
+    global _enabled
+    if sink is not None:
+        add_sink(sink)
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def add_sink(sink):
+    with _lock:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+
+def remove_sink(sink):
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def span(name, rows=None, **args):
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, rows, args)
+
+
+def count_rows(obj):
+    """
+    Row count of a DataFrame, Series or array; None for anything else.
+    """
+    shape = getattr(obj, "shape", None)
+    return shape[0] if shape else None
+
+
+def traced(name=None, rows=None):
+    """
+    Decorator that wraps every call in a span. Rows come from rows(*args, **kwargs)
+    when given, otherwise from the first DataFrame/array argument or, failing that,
+    from the return value.
+    """
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+
+            if rows is not None:
+                n_rows = count_rows(rows(*args, **kwargs))
+            else:
+                n_rows = next((count_rows(arg) for arg in args if count_rows(arg) is not None), None)
+
+            with Span(span_name, n_rows) as current:
+                result = fn(*args, **kwargs)
+                if current.rows is None:
+                    current.rows = count_rows(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def _record(current, end):
+    event = {
+        "name": current.name,
+        "ph": "X",
+        "ts": current.start / 1000,
+        "dur": (end - current.start) / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": dict(current.args, rows=current.rows, depth=current.depth),
+    }
+    with _lock:
+        _events.append(event)
+        sinks = list(_sinks)
+    for sink in sinks:
+        try:
+            sink(event)
+        except Exception as e:
+            print(f"[Trace sink failed] {e}")
+
+
+def format_event(event):
+    """
+    One log line per span, indented by nesting depth.
+    """
+    args = event["args"]
+    line = f"{'  ' * args.get('depth', 0)}⏱ {event['name']}: {event['dur'] / 1000:.1f} ms"
+    if args.get("rows") is not None:
+        line += f" ({args['rows']:,} rows)"
+    if args.get("error"):
+        line += f" [{args['error']}]"
+    return line
+
+
+def events():
+    with _lock:
+        return list(_events)
+
+
+def clear():
+    with _lock:
+        _events.clear()
+
+
+def export_chrome_trace(path):
+    """
+    Writes the recorded spans as Chrome trace JSON (chrome://tracing, ui.perfetto.dev).
+    """
+    recorded = events()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                 "args": {"name": names.get(tid, str(tid))}}
+                for pid, tid in {(event["pid"], event["tid"]) for event in recorded}]
+
+    with open(path, "w") as f:
+        json.dump({"traceEvents": metadata + recorded, "displayTimeUnit": "ms"}, f)
+    return len(recorded)
@@ -1,47 +1,195 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import tkinter as tk
 from tkinter import ttk
+from utils.tracing import traced
 
 
-def plot_predictions(frame, y_true, y_pred):
-    fig, ax = plt.subplots(figsize=(12, 5))  # Wider figure
-    ax.plot(y_true, label='Actual', color="#007acc", linewidth=2)
-    ax.plot(y_pred, label='Predicted', color="#ff6600", linestyle='--', linewidth=2)
-    ax.set_title('Actual vs Predicted Prices', fontsize=16)
-    ax.set_xlabel('Time Steps', fontsize=13)
-    ax.set_ylabel('Price', fontsize=13)
-    ax.legend(fontsize=12)
-    ax.grid(True, linestyle="--", alpha=0.5)
+def minmax_indices(y, n_buckets):
+    """
+    Indices of the min and max of y in each of n_buckets equal slices, in order.
+    Cheap pre-selection that keeps every peak and trough for LTTB; the buckets are
+    a reshaped view, so nothing the size of y is copied.
+    """
+    n = len(y)
+    size = n // n_buckets
+    buckets = y[:size * n_buckets].reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    indices = [[0, n - 1], offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1)]
+    if size * n_buckets < n:
+        tail = y[size * n_buckets:]
+        indices.append([size * n_buckets + tail.argmin(), size * n_buckets + tail.argmax()])
+    return np.unique(np.concatenate(indices))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: picks n_out points of (x, y) that keep the visual
+    shape of the line. Always keeps the first and last points.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
 
-    plt.tight_layout()
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    y = np.where(np.isnan(y), np.nanmean(y), y)
 
-    canvas = FigureCanvasTkAgg(fig, master=frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack()
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle corner
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
 
-    return canvas
+        prev = selected[i]
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        selected[i + 1] = lo + np.argmax(area)
 
+    return selected
+
+
+def downsample(x, y, n_out):
+    """
+    At most ~n_out points of a long series for drawing: min/max pre-selection to
+    4 * n_out candidates, then LTTB.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if len(y) <= n_out:
+        return x, y
+    if len(y) > 4 * n_out:
+        keep = minmax_indices(y, 2 * n_out)
+        x, y = x[keep], y[keep]
+    keep = lttb_indices(x, y, n_out)
+    return x[keep], y[keep]
 
-def plot_volume_chart(frame, dates, volumes):
-    fig, ax = plt.subplots(figsize=(12, 4))  # Wider and clean
-    ax.bar(dates, volumes, color="#4caf50")
-    ax.set_title('Volume over Last 30 Days', fontsize=16)
-    ax.set_xlabel('Date', fontsize=13)
-    ax.set_ylabel('Volume', fontsize=13)
-    ax.tick_params(axis='x', labelrotation=45)
-    ax.grid(True, linestyle="--", alpha=0.5)
 
-    plt.tight_layout()
+class ChartPanel:
+    """
+    One Figure and canvas per dashboard panel, reused across runs.
+    Line series are kept at full resolution but drawn downsampled to the axes width;
+    zooming or panning redraws the visible range from the full data.
+    Figures are built without pyplot, so nothing accumulates in its global registry.
+    """
 
-    canvas = FigureCanvasTkAgg(fig, master=frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack()
+    def __init__(self, frame, title, xlabel, ylabel, figsize=(12, 5), toolbar=True):
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.ax.set_title(title, fontsize=16)
+        self.ax.set_xlabel(xlabel, fontsize=13)
+        self.ax.set_ylabel(ylabel, fontsize=13)
+        self.ax.grid(True, linestyle="--", alpha=0.5)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=frame)
+        if toolbar:
+            # Zoom/pan controls; each view change triggers a detail refresh
+            NavigationToolbar2Tk(self.canvas, frame, pack_toolbar=False).pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.get_tk_widget().pack()
+
+        self.series = {}
+        self.lines = {}
+        self.bars = None
+        self._refresh_pending = False
+        self.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def points_budget(self):
+        # Two points per horizontal pixel is indistinguishable from the full line
+        return max(500, int(self.ax.bbox.width) * 2)
+
+    def set_series(self, label, x, y, **style):
+        """
+        Replaces the data of the line 'label' (created on first use). x must be ascending.
+        """
+        self.series[label] = (np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        if label not in self.lines:
+            self.lines[label], = self.ax.plot([], [], label=label, **style)
+            self.ax.legend(fontsize=12)
+
+    def remove_series(self, label):
+        self.series.pop(label, None)
+        line = self.lines.pop(label, None)
+        if line is not None:
+            line.remove()
+
+    def show_all(self):
+        """
+        Resets the view to the full extent of every series and redraws.
+        """
+        if not self.series:
+            self.canvas.draw_idle()
+            return
+        x_min = min(x[0] for x, _ in self.series.values() if len(x))
+        x_max = max(x[-1] for x, _ in self.series.values() if len(x))
+        y_min = min(np.nanmin(y) for _, y in self.series.values() if len(y))
+        y_max = max(np.nanmax(y) for _, y in self.series.values() if len(y))
+        pad = (y_max - y_min) * 0.05 or 1.0
+
+        self.ax.set_ylim(y_min - pad, y_max + pad)
+        self.ax.set_xlim(x_min, x_max if x_max > x_min else x_min + 1)
+        self.figure.tight_layout()
+        self.refresh()
+
+    def refresh(self):
+        """
+        Redraws every line from the slice of its data inside the current x-range.
+        """
+        self._refresh_pending = False
+        lo, hi = self.ax.get_xlim()
+        budget = self.points_budget()
+        for label, (x, y) in self.series.items():
+            # One extra point on each side so lines run to the edges of the view
+            start = max(np.searchsorted(x, lo, side='left') - 1, 0)
+            stop = min(np.searchsorted(x, hi, side='right') + 1, len(x))
+            self.lines[label].set_data(*downsample(x[start:stop], y[start:stop], budget))
+        self.canvas.draw_idle()
+
+    def _on_xlim_changed(self, ax):
+        # Coalesce the burst of limit changes from a drag into one refresh
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.canvas.get_tk_widget().after_idle(self.refresh)
+
+    def set_bars(self, x, heights, **style):
+        """
+        Replaces the bar series (small categorical data, drawn as-is).
+        """
+        if self.bars is not None:
+            self.bars.remove()
+        self.bars = self.ax.bar(x, heights, **style)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+
+@traced()
+def plot_predictions(frame, y_true, y_pred, panel=None):
+    """
+    Draws actual vs predicted prices, reusing 'panel' from an earlier call when given.
+    """
+    if panel is None:
+        panel = ChartPanel(frame, 'Actual vs Predicted Prices', 'Time Steps', 'Price', figsize=(12, 5))
+    steps = np.arange(len(y_true))
+    panel.set_series('Actual', steps, y_true, color="#007acc", linewidth=2)
+    panel.set_series('Predicted', steps, y_pred, color="#ff6600", linestyle='--', linewidth=2)
+    panel.show_all()
+    return panel
 
-    return canvas
 
+@traced()
+def plot_volume_chart(frame, dates, volumes, panel=None):
+    """
+    Draws the recent volume bars, reusing 'panel' from an earlier call when given.
+    """
+    if panel is None:
+        panel = ChartPanel(frame, 'Volume over Last 30 Days', 'Date', 'Volume', figsize=(12, 4), toolbar=False)
+        panel.ax.tick_params(axis='x', labelrotation=45)
+    panel.set_bars(np.asarray(dates), np.asarray(volumes), color="#4caf50")
+    return panel
 
 
+@traced()
 def plot_comparison_table(parent_frame, data):
     """
     Creates a Treeview table for company comparison (like price change, avg price).
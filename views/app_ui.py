@@ -1,8 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from controllers.prediction_controller import PredictionController
-from utils.visualizations import plot_predictions, plot_volume_chart, plot_comparison_table
-import pandas as pd
+from views.task_runner import TaskRunner
+from utils import tracing
+from utils.metrics import batch_metrics
+import queue
+import threading
+
+# The controller (pandas, scikit-learn) and the charts (matplotlib) are imported on first
+# use; preload_modules warms them on a background thread once the window is up.
+def preload_modules():
+    try:
+        from controllers.prediction_controller import import_models
+        # Under the controller's import lock, in case a model run starts meanwhile
+        import_models()
+        import utils.visualizations  # noqa: F401
+        import views.virtual_table  # noqa: F401
+    except Exception as e:
+        print(f"[Preload failed] {e}")
 
 
 class AppUI:
@@ -17,12 +31,21 @@ class AppUI:
 
         self.root.configure(bg="#f2f2f2")
 
-        self.controller = PredictionController()
-        self.chart_canvas = None
-        self.volume_canvas = None
+        self._controller = None
+        # Loads, model runs and forecasts run off the main thread so the window stays responsive
+        self.tasks = TaskRunner(self.root, max_workers=2, on_change=self.update_task_status)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Chart panels are created on first use and then updated in place
+        self.chart_panel = None
+        self.volume_panel = None
+        self.pred_table = None
+        self.forecast_table = None
         self.df = None
         self.pred_df = None
         self.forecast_df = None
+        self.progress_running = False
+        # Finished trace spans, pushed from any thread and drained on the Tk loop
+        self.trace_events = queue.Queue()
 
         # Create scrollable canvas structure
         self.main_canvas = tk.Canvas(self.root, bg="#f2f2f2")
@@ -61,7 +84,20 @@ class AppUI:
                         padding=8,
                         font=("Segoe UI", 11))
 
+        # Controls and the log paint first; the result panels and heavy imports follow
         self.create_widgets()
+        self.root.after_idle(self.finish_startup)
+
+    @property
+    def controller(self):
+        if self._controller is None:
+            from controllers.prediction_controller import PredictionController
+            self._controller = PredictionController()
+        return self._controller
+
+    def finish_startup(self):
+        self.create_result_panels()
+        threading.Thread(target=preload_modules, name="preload", daemon=True).start()
 
     def add_log(self, message, tag="info"):
         self.log_text.config(state='normal')
@@ -94,9 +130,13 @@ class AppUI:
             "🔹 2. (Optional) Upload your **Inflation Data CSV**:\n"
             "   - Format: One row per year, with columns for each month ('Jan', 'Feb', ..., 'Dec').\n"
             "   - Example headers: 'Year', 'Jan', 'Feb', ..., 'Dec'.\n"
+            "   - A long table with 'Date' and 'Inflation' columns also works.\n"
+            "   - (Optional) Add macro series such as FRED CPI / Fed Funds or EIA weekly stocks as extra features.\n"
             "\n"
             "🔹 3. Select a **Prediction Model**:\n"
-            "   - Options: Naive Baseline, Linear Regression, or Random Forest.\n"
+            "   - Options: Naive Baseline, Linear Regression, Random Forest, or LSTM (needs TensorFlow).\n"
+            "   - Compare All runs the baseline, Linear Regression, Random Forest and an online\n"
+            "     (recursive least squares) linear model together and ranks them.\n"
             "\n"
             "🔹 4. Click **Run**:\n"
             "   - The dashboard will process the data, run the selected model, and generate predictions.\n"
@@ -104,7 +144,8 @@ class AppUI:
             "🔹 5. View Results:\n"
             "   - Metrics: RMSE (Root Mean Squared Error), MAE (Mean Absolute Error), Accuracy (%).\n"
             "   - Charts: Predicted vs Actual Prices, Volume Trend Chart.\n"
-            "   - Tables: 12-Month Price Forecast, Company Price Comparison.\n"
+            "   - Tables: 12-Month Price Forecast with 5% / 50% / 95% bands, Company Price Comparison.\n"
+            "   - Tick 'Compact memory' before uploading very large multi-symbol files.\n"
             "\n"
             "🔹 6. Export Files:\n"
             "   - Save the Predictions and Forecasts into CSV files for further analysis.\n"
@@ -156,6 +197,8 @@ class AppUI:
         self.log_text.tag_config("success", foreground="#4caf50")
         self.log_text.tag_config("error", foreground="#e53935")
         self.log_text.tag_config("calculation", foreground="#3f51b5")
+        self.log_text.tag_config("timing", foreground="#8d6e63")
+        self.log_text.tag_config("memory", foreground="#00897b")
 
 
 
@@ -173,11 +216,17 @@ class AppUI:
         ttk.Button(top_frame, text="Upload", command=self.upload_inflation_file).grid(row=0, column=3, sticky="w",
                                                                                       padx=10, pady=10)
 
+        # Upload extra macro series (CPI, Fed Funds, EIA stocks)
+        ttk.Label(top_frame, text="Macro Series 🏦:", font=("Segoe UI", 13)).grid(row=0, column=4, sticky="e",
+                                                                                 padx=10, pady=10)
+        ttk.Button(top_frame, text="Add", command=self.upload_macro_file).grid(row=0, column=5, sticky="w",
+                                                                               padx=10, pady=10)
+
         # Select Model
         ttk.Label(top_frame, text="Model:", font=("Segoe UI", 13)).grid(row=1, column=0, sticky="e", padx=10, pady=10)
         self.model_var = tk.StringVar()
         model_dropdown = ttk.Combobox(top_frame, textvariable=self.model_var, state="readonly", font=("Segoe UI", 12))
-        model_dropdown['values'] = ["Naive Baseline", "Linear Regression", "Random Forest"]
+        model_dropdown['values'] = ["Naive Baseline", "Linear Regression", "Random Forest", "LSTM", "Compare All"]
         model_dropdown.grid(row=1, column=1, sticky="ew", padx=10, pady=10)
 
         # Run Model
@@ -192,11 +241,39 @@ class AppUI:
         company_dropdown['values'] = ["Chevron", "EOG Resources", "Occidental", "ConocoPhillips"]
         company_dropdown.grid(row=1, column=4, sticky="ew", padx=10, pady=10)
 
+        # Random Forest parameter search
+        ttk.Button(top_frame, text="Tune Forest 🎯", command=self.tune_random_forest).grid(row=1, column=5, sticky="w",
+                                                                                         padx=10, pady=10)
+
+        # Background task status
+        self.progress = ttk.Progressbar(top_frame, mode="indeterminate")
+        self.progress.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=10)
+
+        self.task_label = tk.Label(top_frame, text="Idle", fg="gray", bg="#f2f2f2", font=("Segoe UI", 11))
+        self.task_label.grid(row=2, column=2, columnspan=2, sticky="w", padx=10, pady=10)
+
+        self.cancel_button = ttk.Button(top_frame, text="Cancel ✖", command=self.cancel_tasks)
+        self.cancel_button.grid(row=2, column=4, sticky="w", padx=10, pady=10)
+        self.cancel_button.config(state='disabled')
+
+        # Timing spans for loads, fits, forecasts and plots
+        self.trace_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="Trace timings ⏱", variable=self.trace_var,
+                        command=self.toggle_tracing).grid(row=2, column=5, sticky="w", padx=10, pady=10)
+        ttk.Button(top_frame, text="Export Trace", command=self.export_trace).grid(row=2, column=6, sticky="w",
+                                                                                   padx=10, pady=10)
+
+        # Compact memory: float32 prices, categorical text, unused columns dropped (next load)
+        self.compact_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="Compact memory 🗜", variable=self.compact_var,
+                        command=self.toggle_compact).grid(row=2, column=7, sticky="w", padx=10, pady=10)
+
         # File Label
         self.file_label = tk.Label(self.scrollable_frame, text="No Price CSV Loaded", fg="gray",
                                    bg="#f2f2f2", font=("Segoe UI", 13))
         self.file_label.pack(pady=10)
 
+    def create_result_panels(self):
         # Metric Cards
         metric_frame = tk.Frame(self.scrollable_frame, bg="#f2f2f2")
         metric_frame.pack(pady=30, fill="x", padx=30)
@@ -256,26 +333,101 @@ class AppUI:
             messagebox.showerror("Error", "Please upload a CSV first.")
             return
 
+        if model == "Compare All":
+            self.add_log("🏁 Comparing Naive Baseline, Linear Regression, Random Forest and Online Linear...", "info")
+            self.tasks.submit(model, self.compare_models_job,
+                              on_success=self.show_comparison_results,
+                              on_error=lambda e: self.show_task_error("Model comparison failed", e))
+            return
+
+        if model not in ("Naive Baseline", "Linear Regression", "Random Forest", "LSTM"):
+            messagebox.showerror("Model Error", "Model not recognized.")
+            return
+
         self.add_log(f"🚀 Running model: {model}", "info")
+        self.tasks.submit(model, self.run_model_job, model,
+                          on_success=lambda result: self.show_model_results(model, result),
+                          on_error=lambda e: self.show_task_error(f"Model {model} failed", e))
 
+    def tune_random_forest(self):
+        if self.df is None:
+            messagebox.showerror("Error", "Please upload a CSV first.")
+            return
+
+        self.add_log("🎯 Tuning Random Forest (successive halving over time-ordered folds)...", "info")
+        self.tasks.submit("Tuning Random Forest", self.controller.tune_random_forest_model,
+                          on_success=self.show_tuning_results,
+                          on_error=lambda e: self.show_task_error("Random Forest tuning failed", e))
+
+    def show_tuning_results(self, result):
+        params = ", ".join(f"{name}={value}" for name, value in result["best_params"].items())
+        self.add_log(f"✅ Best Random Forest: {params}", "success")
+        self.add_log(f"• CV RMSE: {result['best_rmse']:.2f} over {result['n_candidates']} candidates, "
+                     f"{result['n_fits']} fits in {result['seconds']:.1f}s", "calculation")
+        self.add_log("• Random Forest runs now use these parameters.", "calculation")
+
+    def run_model_job(self, model):
+        """
+        Runs on a worker thread: fits the model and builds the forecast, no Tk calls.
+        """
         if model == "Naive Baseline":
-            rmse, mae, y_test, y_pred = self.controller.run_baseline_model()
+            result = self.controller.run_baseline_model()
         elif model == "Linear Regression":
-            rmse, mae, y_test, y_pred = self.controller.run_linear_regression_model()
-            self.show_plot(y_test, y_pred)
+            result = self.controller.run_linear_regression_model()
         elif model == "Random Forest":
-            rmse, mae, y_test, y_pred = self.controller.run_random_forest_model()
-            self.show_plot(y_test, y_pred)
+            result = self.controller.run_random_forest_model()
         else:
-            messagebox.showerror("Model Error", "Model not recognized.")
+            result = self.controller.run_lstm_model()
+
+        forecast_df = self.controller.forecast_next_months()
+        return result + (forecast_df,)
+
+    def compare_models_job(self):
+        """
+        Runs on a worker thread: fits every model on the shared features and builds the forecast.
+        """
+        leaderboard, results = self.controller.compare_models()
+        return leaderboard, results, self.controller.forecast_next_months()
+
+    def show_comparison_results(self, result):
+        leaderboard, results, forecast_df = result
+        names = {"baseline": "Naive Baseline", "linear": "Linear Regression",
+                 "random_forest": "Random Forest", "online": "Online Linear", "lstm": "LSTM"}
+
+        scored = leaderboard["Test Rows"].dropna()
+        rows = f", {int(scored.iloc[0])} shared test rows" if len(scored) else ""
+        self.add_log(f"🏁 Model Leaderboard (lowest RMSE first{rows}):", "calculation")
+        for rank, row in leaderboard.iterrows():
+            name = names.get(row["Model"], row["Model"])
+            if row["Error"]:
+                self.add_log(f"• {name}: failed ({row['Error']})", "error")
+                continue
+            self.add_log(f"{rank + 1}. {name}: RMSE {row['RMSE']:.2f}, MAE {row['MAE']:.2f}, "
+                         f"MAPE {row['MAPE']:.2f}%, Direction {row['Directional Accuracy']:.1f}%, "
+                         f"{row['Seconds']:.2f}s", "calculation")
+
+        if not results:
             return
+        # The dashboard then shows the winner like a single run
+        best = leaderboard["Model"].iloc[0]
+        y_test, y_pred = results[best]
+        row = leaderboard.iloc[0]
+        self.show_model_results(names.get(best, best), (row["RMSE"], row["MAE"], y_test, y_pred, forecast_df))
+
+    def show_model_results(self, model, result):
+        rmse, mae, y_test, y_pred, forecast_df = result
+        self.add_log(f"✅ {model} finished.", "success")
+
+        if model in ("Linear Regression", "Random Forest", "Online Linear", "LSTM"):
+            self.show_plot(y_test, y_pred)
 
         self.rmse_label.config(text=f"{rmse:.2f}")
         self.mae_label.config(text=f"{mae:.2f}")
 
         if y_test is not None and y_pred is not None:
             self.show_predictions_table(y_test, y_pred)
-            accuracy = 100.0 - (mae / y_test.mean() * 100)
+            scores = batch_metrics(y_test, y_pred)
+            accuracy = scores["accuracy"]
             self.acc_label.config(text=f"{accuracy:.2f}%")
             self.export_button.config(state='normal')
 
@@ -284,6 +436,8 @@ class AppUI:
             self.add_log(f"• RMSE: {rmse:.2f}", "calculation")
             self.add_log(f"• MAE: {mae:.2f}", "calculation")
             self.add_log(f"• Accuracy: {accuracy:.2f}%", "calculation")
+            self.add_log(f"• MAPE: {scores['mape']:.2f}%", "calculation")
+            self.add_log(f"• Directional Accuracy: {scores['directional_accuracy']:.2f}%", "calculation")
 
             # 🔥 Full Final Summary block
             summary_lines = []
@@ -312,8 +466,10 @@ class AppUI:
             for line in summary_lines:
                 self.add_log(line, "calculation")
 
-        self.show_forecast_table()
+        self.show_forecast_table(forecast_df)
         self.show_volume_chart()
+        # The run added its lag feature matrix
+        self.report_memory()
         self.show_comparison_table([
             ("Chevron", 157.92, 3.92),
             ("EOG Resources", 567.19, 1.24),
@@ -321,36 +477,34 @@ class AppUI:
             ("Phillips 66", 441.10, -2.76),
         ])
 
-    def show_forecast_table(self):
-        for widget in self.forecast_table_frame.winfo_children():
-            widget.destroy()
-
-        forecast_df = self.controller.forecast_next_months()
+    def show_forecast_table(self, forecast_df):
         self.forecast_df = forecast_df
 
         if forecast_df.empty:
+            for widget in self.forecast_table_frame.winfo_children():
+                widget.destroy()
+            self.forecast_table = None
             tk.Label(self.forecast_table_frame, text="No forecast available.", bg="#f2f2f2").pack()
             return
 
         self.export_forecast_button.config(state='normal')
 
-        # Add title
-        title = tk.Label(self.forecast_table_frame, text="🔮 Forecasted Prices (Next 12 Months)",
-                         font=("Segoe UI", 16, "bold"), bg="#f2f2f2", anchor="w")
-        title.pack(fill="x", padx=20, pady=(10, 5))
+        if self.forecast_table is None:
+            from views.virtual_table import VirtualTable
+            for widget in self.forecast_table_frame.winfo_children():
+                widget.destroy()
 
-        table = ttk.Treeview(self.forecast_table_frame, columns=("Month", "Forecasted Price"), show="headings",
-                             height=8)
-        table.heading("Month", text="Month")
-        table.heading("Forecasted Price", text="Forecasted Price")
-        table.column("Month", width=200, anchor='center')
-        table.column("Forecasted Price", width=200, anchor='center')
+            # Add title
+            title = tk.Label(self.forecast_table_frame, text="🔮 Forecasted Prices", font=("Segoe UI", 16, "bold"),
+                             bg="#f2f2f2", anchor="w")
+            title.pack(fill="x", padx=20, pady=(10, 5))
 
-        table.pack(fill="x", padx=20, pady=10)
+            # Month, point forecast and the 5% / 50% / 95% bootstrap bands
+            self.forecast_table = VirtualTable(self.forecast_table_frame, height=12, column_width=140,
+                                               date_column="Month")
+            self.forecast_table.pack(fill="x", padx=20, pady=10)
 
-        for i in range(min(12, len(forecast_df))):
-            row = forecast_df.iloc[i]
-            table.insert('', tk.END, values=(row["Month"].strftime('%Y-%m-%d'), f"{row['Forecasted Price']:.2f}"))
+        self.forecast_table.set_data(forecast_df)
 
     def create_metric_card(self, parent, title, value, col):
         frame = tk.Frame(parent, bg="#ffffff", bd=2, relief="ridge", padx=20, pady=20)
@@ -369,50 +523,150 @@ class AppUI:
     def upload_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
         if file_path:
-            self.add_log(f"📂 Uploading price data: {file_path.split('/')[-1]}", "info")  # LOG BEFORE loading
-            self.df = self.controller.load_dataset(file_path)
-            if self.df is not None:
-                self.file_label.config(text=f"\U0001F4C1 {file_path.split('/')[-1]}")
-                self.update_metric_cards()
-                self.add_log(f"✅ Price data loaded successfully.", "success")
-            else:
-                messagebox.showerror("Error", "Failed to load CSV file.")
-                self.add_log(f"❌ Error: Failed to load price data.", "error")
+            file_name = file_path.split('/')[-1]
+            self.add_log(f"📂 Uploading price data: {file_name}", "info")  # LOG BEFORE loading
+            self.tasks.submit(f"Loading {file_name}", self.controller.load_dataset, file_path,
+                              on_success=lambda df: self.on_dataset_loaded(file_name, df),
+                              on_error=lambda e: self.show_task_error("Failed to load CSV file", e))
+
+    def on_dataset_loaded(self, file_name, df):
+        self.df = df
+        if self.df is not None:
+            self.file_label.config(text=f"\U0001F4C1 {file_name}")
+            # The cards come from the loaded frame; the file is read once
+            self.update_metric_cards()
+            self.add_log(f"✅ Price data loaded successfully.", "success")
+            self.report_memory()
+        else:
+            messagebox.showerror("Error", "Failed to load CSV file.")
+            self.add_log(f"❌ Error: Failed to load price data.", "error")
 
     def upload_inflation_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
         if file_path:
-            self.add_log(f"📂 Uploading inflation data: {file_path.split('/')[-1]}", "info")  # LOG BEFORE loading
-            self.controller.load_inflation_data(file_path)
-            messagebox.showinfo("Success", "Inflation data loaded.")
-            self.add_log(f"✅ Inflation data loaded successfully.", "success")
-
-    def update_metric_cards(self):
-        price_col = self.get_price_col()
-        if price_col:
-            prices = self.df[price_col]
-            self.avg_label.config(text=f"${prices.mean():.2f}")
-            self.high_label.config(text=f"${prices.max():.2f}")
-            self.low_label.config(text=f"${prices.min():.2f}")
+            file_name = file_path.split('/')[-1]
+            self.add_log(f"📂 Uploading inflation data: {file_name}", "info")  # LOG BEFORE loading
+            self.tasks.submit(f"Loading {file_name}", self.controller.load_inflation_data, file_path,
+                              on_success=lambda _: self.on_inflation_loaded(),
+                              on_error=lambda e: self.show_task_error("Failed to load inflation data", e))
+
+    def on_inflation_loaded(self):
+        messagebox.showinfo("Success", "Inflation data loaded.")
+        self.add_log(f"✅ Inflation data loaded successfully.", "success")
+        self.report_memory()
+
+    def upload_macro_file(self):
+        file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
+        if file_path:
+            file_name = file_path.split('/')[-1]
+            self.add_log(f"📂 Adding macro series: {file_name}", "info")
+            self.tasks.submit(f"Loading {file_name}", self.controller.load_macro_series, file_path,
+                              on_success=self.on_macro_loaded,
+                              on_error=lambda e: self.show_task_error("Failed to load macro series", e))
+
+    def on_macro_loaded(self, series):
+        self.add_log(f"✅ Macro series '{series.name}' added ({len(series.dates):,} observations). "
+                     f"Model features: {', '.join(self.controller.macros.names())}", "success")
+        self.report_memory()
+
+    def update_task_status(self, labels):
+        if labels:
+            if not self.progress_running:
+                self.progress.start(10)
+                self.progress_running = True
+            queued = f" (+{len(labels) - 1} more)" if len(labels) > 1 else ""
+            self.task_label.config(text=f"⏳ {labels[0]}{queued}", fg="#1976D2")
+            self.cancel_button.config(state='normal')
+        else:
+            self.progress.stop()
+            self.progress_running = False
+            self.task_label.config(text="Idle", fg="gray")
+            self.cancel_button.config(state='disabled')
+
+    def cancel_tasks(self):
+        self.tasks.cancel_all()
+        self.add_log("✖ Cancelled pending runs.", "error")
+
+    def show_task_error(self, title, error):
+        messagebox.showerror("Error", f"{title}: {error}")
+        self.add_log(f"❌ Error: {title}: {error}", "error")
+
+    def toggle_compact(self):
+        self.controller.compact = self.compact_var.get()
+        if self.compact_var.get():
+            self.add_log("🗜 Compact memory on: the next price file loads with float32 prices, "
+                         "categorical text and only the columns the models use.", "memory")
+        else:
+            self.add_log("🗜 Compact memory off: the next price file loads in full.", "memory")
+
+    def report_memory(self):
+        # Deep memory sizing walks every string, so it runs off the Tk thread
+        self.tasks.submit("Measuring memory", self.controller.memory_usage,
+                          on_success=self.show_memory_usage,
+                          on_error=lambda e: self.show_task_error("Memory report failed", e))
+
+    def show_memory_usage(self, stages):
+        self.add_log("🧮 Memory: " + " · ".join(f"{stage} {mb:.2f} MB" for stage, mb in stages), "memory")
+
+    def toggle_tracing(self):
+        if self.trace_var.get():
+            tracing.enable(self.trace_events.put)
+            self.add_log("⏱ Tracing on: span timings will appear here.", "timing")
+            self.root.after(100, self.drain_trace_events)
+        else:
+            tracing.disable()
+            self.add_log("⏱ Tracing off.", "timing")
+
+    def drain_trace_events(self):
+        while True:
+            try:
+                event = self.trace_events.get_nowait()
+            except queue.Empty:
+                break
+            self.add_log(tracing.format_event(event), "timing")
+        if tracing.is_enabled():
+            self.root.after(100, self.drain_trace_events)
+
+    def export_trace(self):
+        if not tracing.events():
+            messagebox.showinfo("Export Trace", "No spans recorded yet. Turn on 'Trace timings' and run a model.")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Trace JSON", "*.json")])
+        if file_path:
+            count = tracing.export_chrome_trace(file_path)
+            self.add_log(f"⏱ Exported {count} spans to {file_path} (open in ui.perfetto.dev).", "timing")
+
+    def on_close(self):
+        tracing.disable()
+        tracing.remove_sink(self.trace_events.put)
+        self.tasks.shutdown()
+        self.root.destroy()
+
+    def update_metric_cards(self, summary=None):
+        if summary is None:
+            summary = self.controller.summarize_prices()
+        if summary.count:
+            self.avg_label.config(text=f"${summary.mean:.2f}")
+            self.high_label.config(text=f"${summary.high:.2f}")
+            self.low_label.config(text=f"${summary.low:.2f}")
 
     def get_price_col(self):
-        for col in self.df.columns:
-            if col.lower() in ['close', 'price']:
-                return col
-        return None
+        from utils.data_loader import find_price_col
+        return find_price_col(self.df)
 
     def show_plot(self, y_true, y_pred):
-        if self.chart_canvas:
-            self.chart_canvas.get_tk_widget().destroy()
-        self.chart_canvas = plot_predictions(self.chart_frame, y_true, y_pred)
+        from utils.visualizations import plot_predictions
+        self.chart_panel = plot_predictions(self.chart_frame, y_true, y_pred, self.chart_panel)
 
     def show_volume_chart(self):
-        for widget in self.volume_frame.winfo_children():
-            widget.destroy()
         if 'Date' in self.df.columns and 'Volume' in self.df.columns:
             dates = self.df['Date'].tail(30)
             volumes = self.df['Volume'].tail(30)
-            self.volume_canvas = plot_volume_chart(self.volume_frame, dates, volumes)
+            from utils.visualizations import plot_volume_chart
+            self.volume_panel = plot_volume_chart(self.volume_frame, dates, volumes, self.volume_panel)
+        elif self.volume_panel is not None:
+            # Keep the panel but drop the previous dataset's bars
+            self.volume_panel.set_bars([], [])
 
     def show_comparison_table(self, data):
         for widget in self.table_frame.winfo_children():
@@ -438,27 +692,25 @@ class AppUI:
             table.insert('', tk.END, values=(company, price, change))
 
     def show_predictions_table(self, y_true, y_pred):
-        for widget in self.pred_table_frame.winfo_children():
-            widget.destroy()
-
-        # Add title above table
-        title = tk.Label(self.pred_table_frame, text="📈 Predictions vs Actual", font=("Segoe UI", 16, "bold"),
-                         bg="#f2f2f2", anchor="w")
-        title.pack(fill="x", padx=20, pady=(10, 5))
-
+        import pandas as pd
+        from views.virtual_table import VirtualTable
         self.pred_df = pd.DataFrame({"Actual": y_true, "Predicted": y_pred})
-        df = self.pred_df.round(2).reset_index(drop=True)
-
-        table = ttk.Treeview(self.pred_table_frame, columns=("Actual", "Predicted"), show="headings", height=8)
-        table.heading("Actual", text="Actual")
-        table.heading("Predicted", text="Predicted")
-        table.column("Actual", width=150, anchor='center')
-        table.column("Predicted", width=150, anchor='center')
-
-        table.pack(fill="x", padx=20, pady=10)
-
-        for i in range(min(50, len(df))):
-            table.insert('', tk.END, values=(df.loc[i, "Actual"], df.loc[i, "Predicted"]))
+        # Date of every prediction when the test rows can be traced back to the dataset
+        if isinstance(y_true, pd.Series) and 'Date' in self.df.columns and y_true.index.isin(self.df.index).all():
+            self.pred_df.insert(0, "Date", self.df.loc[y_true.index, 'Date'].to_numpy())
+        self.pred_df = self.pred_df.reset_index(drop=True)
+
+        if self.pred_table is None:
+            # Add title above table
+            title = tk.Label(self.pred_table_frame, text="📈 Predictions vs Actual", font=("Segoe UI", 16, "bold"),
+                             bg="#f2f2f2", anchor="w")
+            title.pack(fill="x", padx=20, pady=(10, 5))
+
+            # Every prediction is browsable; only the visible page is rendered
+            self.pred_table = VirtualTable(self.pred_table_frame, height=15, column_width=150, date_column="Date")
+            self.pred_table.pack(fill="x", padx=20, pady=10)
+
+        self.pred_table.set_data(self.pred_df)
 
     def export_predictions(self):
         if self.pred_df is not None:
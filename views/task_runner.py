@@ -0,0 +1,106 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Task:
+    """
+    Handle for one piece of background work.
+    Cancelling a task that has not started drops it from the queue; a running task
+    finishes in its worker but its result is discarded.
+    """
+
+    def __init__(self, task_id, label):
+        self.id = task_id
+        self.label = label
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class TaskRunner:
+    """
+    Runs blocking controller calls (CSV loads, model fits, forecasts) on a thread pool
+    and hands their results back to the Tk main loop through root.after, since Tk
+    widgets may only be touched from the main thread.
+    """
+
+    def __init__(self, root, max_workers=2, poll_ms=50, on_change=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_change = on_change
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard-task")
+        self.results = queue.Queue()
+        self.tasks = {}
+        self._ids = itertools.count(1)
+        self._polling = False
+
+    def submit(self, label, fn, *args, on_success=None, on_error=None, **kwargs):
+        task = Task(next(self._ids), label)
+        self.tasks[task.id] = (task, on_success, on_error)
+        task.future = self.executor.submit(self._run, task, fn, args, kwargs)
+
+        self._notify()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return task
+
+    def _run(self, task, fn, args, kwargs):
+        if task.cancelled:
+            return
+        try:
+            self.results.put((task, fn(*args, **kwargs), None))
+        except Exception as e:
+            self.results.put((task, None, e))
+
+    def _poll(self):
+        while True:
+            try:
+                task, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            _, on_success, on_error = self.tasks.pop(task.id, (task, None, None))
+            if task.cancelled:
+                continue
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_success:
+                on_success(result)
+
+        # Tasks cancelled before they started never report back
+        for task_id in [tid for tid, (task, _, _) in self.tasks.items() if task.future.cancelled()]:
+            del self.tasks[task_id]
+
+        self._notify()
+        if self.tasks:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change(self.active_labels())
+
+    def active_labels(self):
+        return [task.label for task, _, _ in self.tasks.values() if not task.cancelled]
+
+    def cancel_all(self):
+        for task, _, _ in list(self.tasks.values()):
+            task.cancel()
+        self._notify()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,209 @@
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+import pandas as pd
+
+
+class VirtualTable(tk.Frame):
+    """
+    Treeview that shows any number of DataFrame rows with a fixed pool of items.
+    Only the visible page is formatted and written into the Treeview; scrolling,
+    sorting and jumping just move a window over a row order array.
+
+    Click a heading to sort by it (click again to reverse). With date_column set,
+    an entry above the table jumps to the nearest row for a typed date.
+    """
+
+    def __init__(self, parent, height=15, column_width=150, date_column=None, formatters=None, **kwargs):
+        kwargs.setdefault("bg", "#f2f2f2")
+        super().__init__(parent, **kwargs)
+        self.height = height
+        self.column_width = column_width
+        self.date_column = date_column
+        self.formatters = formatters or {}
+
+        self.df = None
+        self.values = {}
+        self.order = np.arange(0)
+        self.top = 0
+        self.sort_column = None
+        self.sort_ascending = True
+
+        if date_column:
+            jump_frame = tk.Frame(self, bg=kwargs["bg"])
+            jump_frame.pack(fill="x", pady=(0, 5))
+            tk.Label(jump_frame, text=f"Go to {date_column}:", bg=kwargs["bg"]).pack(side="left")
+            self.jump_var = tk.StringVar()
+            entry = ttk.Entry(jump_frame, textvariable=self.jump_var, width=14)
+            entry.pack(side="left", padx=5)
+            entry.bind("<Return>", lambda e: self.jump_to_text())
+            ttk.Button(jump_frame, text="Go", command=self.jump_to_text).pack(side="left")
+            self.position_label = tk.Label(jump_frame, text="", fg="gray", bg=kwargs["bg"])
+            self.position_label.pack(side="right")
+        else:
+            self.position_label = None
+
+        body = tk.Frame(self, bg=kwargs["bg"])
+        body.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(body, show="headings", height=height, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self.step_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.step_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.scroll_by(-self.height) or "break")
+        self.tree.bind("<Next>", lambda e: self.scroll_by(self.height) or "break")
+        self.tree.bind("<Home>", lambda e: self.scroll_to(0) or "break")
+        self.tree.bind("<End>", lambda e: self.scroll_to(len(self.order)) or "break")
+
+    def set_data(self, df):
+        """
+        Shows df (in its current row order); the previous sort is cleared.
+        """
+        self.df = df
+        self.values = {col: df[col].to_numpy() for col in df.columns}
+        self.order = np.arange(len(df))
+        self.sort_column = None
+        self.top = 0
+
+        columns = list(df.columns)
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(columns=columns)
+        for col in columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=self.column_width, anchor="center")
+
+        # A fixed pool of items, refilled on every scroll
+        for i in range(min(self.height, len(df))):
+            self.tree.insert("", tk.END, iid=str(i))
+        self.render()
+
+    def format_value(self, col, value):
+        if col in self.formatters:
+            return self.formatters[col](value)
+        if isinstance(value, (float, np.floating)):
+            return "" if np.isnan(value) else f"{value:.2f}"
+        if isinstance(value, (np.datetime64, pd.Timestamp)):
+            return "" if pd.isna(value) else pd.Timestamp(value).strftime("%Y-%m-%d")
+        return value
+
+    def render(self):
+        rows = self.order[self.top:self.top + self.height]
+        columns = list(self.values)
+        for i, row in enumerate(rows):
+            self.tree.item(str(i), values=[self.format_value(col, self.values[col][row]) for col in columns])
+        # Items past the end of a short final page are blanked
+        for i in range(len(rows), len(self.tree.get_children())):
+            self.tree.item(str(i), values=[""] * len(columns))
+
+        total = len(self.order)
+        if total:
+            self.scrollbar.set(self.top / total, min(self.top + self.height, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+        if self.position_label is not None:
+            self.position_label.config(
+                text=f"Rows {self.top + 1:,}–{self.top + len(rows):,} of {total:,}" if total else "No rows")
+
+    def scroll_to(self, top):
+        self.top = int(max(0, min(top, len(self.order) - self.height)))
+        self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * len(self.order)))
+        elif action == "scroll":
+            self.scroll_by(int(amount) * (self.height if unit == "pages" else 1))
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def step_selection(self, delta):
+        # Arrow keys move the highlight inside the page and scroll at its edges
+        selected = self.tree.selection()
+        position = int(selected[0]) + delta if selected else 0
+        if position < 0:
+            self.scroll_by(-1)
+            position = 0
+        elif position >= self.height:
+            self.scroll_by(1)
+            position = self.height - 1
+        if position < len(self.tree.get_children()):
+            self.tree.selection_set(str(position))
+        return "break"
+
+    def sort_by(self, col):
+        if self.df is None:
+            return
+        self.sort_ascending = not self.sort_ascending if self.sort_column == col else True
+        self.sort_column = col
+
+        order = np.argsort(self.values[col], kind="stable")
+        self.order = order if self.sort_ascending else order[::-1]
+
+        for name in self.values:
+            arrow = (" ▲" if self.sort_ascending else " ▼") if name == col else ""
+            self.tree.heading(name, text=f"{name}{arrow}")
+        self.scroll_to(0)
+
+    def jump_to(self, value, col=None):
+        """
+        Scrolls to the row whose 'col' value is nearest to 'value' and selects it.
+        Returns the row's position in the current order, or None if nothing matched.
+        """
+        col = col or self.date_column
+        if self.df is None or not len(self.order) or col not in self.values:
+            return None
+
+        ordered = self.values[col][self.order]
+        dtype = self.df[col].dtype
+        if isinstance(dtype, pd.DatetimeTZDtype) or np.issubdtype(ordered.dtype, np.datetime64):
+            # Compare as float nanoseconds (UTC for tz-aware columns) so missing dates become NaN;
+            # tz-aware values are object arrays, so they are read from the frame's column
+            dates = pd.DatetimeIndex(self.df[col])
+            missing = dates.isna()[self.order]
+            ordered = dates.as_unit("ns").asi8[self.order].astype(float)
+            ordered[missing] = np.nan
+            target = pd.Timestamp(value)
+            if dates.tz is not None:
+                target = target.tz_localize(dates.tz) if target.tzinfo is None else target.tz_convert(dates.tz)
+            elif target.tzinfo is not None:
+                target = target.tz_convert(None)
+            target = float(target.as_unit("ns").value)
+        else:
+            ordered = ordered.astype(float)
+            target = float(value)
+
+        if self.sort_column == col or (self.sort_column is None and np.all(np.diff(ordered) >= 0)):
+            # Sorted column: binary search (descending order is searched on the reversed view)
+            ascending = self.sort_column != col or self.sort_ascending
+            search = ordered if ascending else ordered[::-1]
+            position = min(np.searchsorted(search, target), len(search) - 1)
+            if position > 0 and abs(search[position - 1] - target) <= abs(search[position] - target):
+                position -= 1
+            if not ascending:
+                position = len(search) - 1 - position
+        else:
+            position = int(np.nanargmin(np.abs(ordered - target)))
+
+        self.scroll_to(position - self.height // 2)
+        self.tree.selection_set(str(position - self.top))
+        return position
+
+    def jump_to_text(self):
+        text = self.jump_var.get().strip()
+        if not text:
+            return
+        try:
+            self.jump_to(text)
+        except (ValueError, TypeError):
+            self.position_label.config(text=f"Not a date: {text}")